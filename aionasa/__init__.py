@@ -1,14 +1,111 @@
 __version__ = "0.2.1"
 
-from .apod.api import APOD
-from .apod.data import AstronomyPicture
-from .asset import Asset
-from .client import BaseClient
-from .epic.api import EPIC
-from .epic.data import EarthImage
+import importlib as _importlib
+
 from .errors import *
-from .exoplanet.api import Exoplanet
-from .insight.api import InSight
-from .neows.api import NeoWs
-from .neows.data import Asteroid
-from .rate_limit import RateLimiter
+
+# Equivalent to typing.TYPE_CHECKING, without paying for importing typing.
+TYPE_CHECKING = False
+
+# Public names are imported on first access, so ``import aionasa`` stays cheap
+# and only the clients that are actually used (and aiohttp) get loaded.
+_LAZY_ATTRIBUTES = {
+    "APOD": ".apod.api",
+    "AstronomyPicture": ".apod.data",
+    "Asset": ".asset",
+    "AssetStream": ".asset",
+    "AssetCache": ".cache",
+    "AssetCacheEntry": ".cache",
+    "ResponseCache": ".cache",
+    "SQLiteCache": ".cache",
+    "BaseClient": ".client",
+    "DownloadManager": ".downloads",
+    "DownloadProgress": ".downloads",
+    "DownloadResult": ".downloads",
+    "EPIC": ".epic.api",
+    "EarthImage": ".epic.data",
+    "Exoplanet": ".exoplanet.api",
+    "InSight": ".insight.api",
+    "KeyPool": ".keys",
+    "NeoWs": ".neows.api",
+    "Asteroid": ".neows.data",
+    "Plan": ".planner",
+    "PlannedRequest": ".planner",
+    "Priority": ".rate_limit",
+    "RateLimiter": ".rate_limit",
+    "SharedRateLimiter": ".rate_limit",
+    "RetryPolicy": ".retry",
+    "RequestTrace": ".tracing",
+    "Tracer": ".tracing",
+    "Transport": ".transport",
+}
+
+# Submodules and subpackages, which used to be loaded by ``import aionasa`` and are still reachable as attributes.
+_LAZY_SUBMODULES = {
+    "apod",
+    "asset",
+    "cache",
+    "client",
+    "downloads",
+    "epic",
+    "errors",
+    "exoplanet",
+    "insight",
+    "keys",
+    "neows",
+    "planner",
+    "rate_limit",
+    "replay",
+    "retry",
+    "sync",
+    "tracing",
+    "transport",
+    "utils",
+}
+
+if TYPE_CHECKING:
+    from .apod.api import APOD
+    from .apod.data import AstronomyPicture
+    from .asset import Asset, AssetStream
+    from .cache import AssetCache, AssetCacheEntry, ResponseCache, SQLiteCache
+    from .client import BaseClient
+    from .downloads import DownloadManager, DownloadProgress, DownloadResult
+    from .epic.api import EPIC
+    from .epic.data import EarthImage
+    from .exoplanet.api import Exoplanet
+    from .insight.api import InSight
+    from .keys import KeyPool
+    from .neows.api import NeoWs
+    from .neows.data import Asteroid
+    from .planner import Plan, PlannedRequest
+    from .rate_limit import Priority, RateLimiter, SharedRateLimiter
+    from .retry import RetryPolicy
+    from .tracing import RequestTrace, Tracer
+    from .transport import Transport
+
+del TYPE_CHECKING
+
+__all__ = [
+    "NASAException",
+    "APIException",
+    "ArgumentError",
+    "PandasNotFound",
+    "DigestMismatch",
+    *_LAZY_ATTRIBUTES,
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        # importing a submodule also binds it as an attribute of the package
+        return _importlib.import_module(f".{name}", __name__)
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES)
@@ -3,8 +3,8 @@ import asyncio
 import json
 
 import aiohttp
-import yaml
 
+from ..downloads import DownloadManager
 from ..errors import ArgumentError
 from ..utils import date_strptime
 from .api import APOD
@@ -73,6 +73,8 @@ def dump_to_csv(data, filename):
 
 
 def dump_to_yaml(data, filename):
+    import yaml  # only needed for yaml output, and slow to import
+
     with open(filename, "w") as f:
         yaml.dump(data, f, yaml.Dumper)
 
@@ -145,9 +147,15 @@ async def batch_get(start_date, end_date, _print, dump, download, key, timeout):
                 dump_to_yaml(data, dump)
 
         if download:
-            await asyncio.gather(
-                *[download_image(picture, download, True) for picture in data]
-            )
+            manager = DownloadManager(progress=print)
+            results = await manager.download(data, download)
+            for result in results:
+                if isinstance(result.error, NotImplementedError):
+                    print(f"Could not download url, skipping: {result.asset.url}")
+                elif not result.ok:
+                    print(
+                        f"Download failed: {result.asset.url} ({result.error!r}, run again to resume)"
+                    )
 
 
 async def download_image(picture, path, ignore_not_implemented=False):
@@ -171,8 +179,10 @@ async def download_image(picture, path, ignore_not_implemented=False):
         print(f"Starting download: {url}")
         b = await picture.save(filepath)
         print(f"Downloaded: {url} ({b/1000} KB)")
-    except asyncio.TimeoutError:
-        print(f"Download failed: {url}")
+    except (asyncio.TimeoutError, aiohttp.ClientError):
+        print(
+            f"Download failed: {url} (partial file kept at {filepath}.part, run again to resume)"
+        )
         raise
 
 
@@ -4,31 +4,65 @@ from typing import List
 
 from ..client import BaseClient
 from ..errors import *
+from ..planner import aligned_ranges, plan_requests
 from ..rate_limit import default_rate_limiter, demo_rate_limiter
 from .data import AstronomyPicture
 
 logger = logging.getLogger("aionasa.apod")
 
+# Date of the first APOD entry.
+APOD_EPOCH = datetime.date(1995, 6, 16)
+
+# Number of days covered by each request when planning large batches.
+# Much longer ranges make for slow responses that are more likely to time out.
+BATCH_CHUNK_DAYS = 100
+
+
+def _is_past(date):
+    # APOD publishes on US time, so allow a day of slack before treating an entry as final.
+    return date < datetime.date.today() - datetime.timedelta(days=1)
+
 
 class APOD(BaseClient):
     """Client for NASA Astronomy Picture of the Day API.
 
     Parameters
     ----------
-    api_key: :class:`str`
-        NASA API key to be used by the client.
+    api_key: :class:`Union[str, KeyPool]`
+        NASA API key to be used by the client, or a KeyPool to spread requests across several keys.
     session: :class:`Optional[aiohttp.ClientSession]`
         Optional ClientSession to be used for requests made by this client. Creates a new session by default.
     rate_limiter: :class:`Optional[RateLimiter]`
         Optional RateLimiter class to be used by this client. Uses the library's internal global rate limiting by default.
+    transport: :class:`Optional[Transport]`
+        Optional shared Transport to attach to. Ignored if ``session`` is passed.
+    cache: :class:`Optional[ResponseCache]`
+        Optional cache to serve repeated requests from instead of the network.
+    asset_cache: :class:`Optional[AssetCache]`
+        Optional store to serve repeated image downloads from instead of the network.
+    retry_policy: :class:`Optional[RetryPolicy]`
+        Optional policy for retrying failed requests. Failed requests are not retried by default.
+    tracer: :class:`Optional[Tracer]`
+        Optional tracer that records per-phase timing for each request.
+    redirects: :class:`Optional[dict]`
+        Optional mapping of URL prefixes to replacements, e.g. :attr:`StubServer.redirects`.
+    priority: :class:`Priority`
+        Priority of this client's requests in its rate limiter. Use ``Priority.BACKGROUND`` for bulk jobs
+        that should yield to interactive requests sharing the same limiter. Defaults to ``Priority.NORMAL``.
     """
 
+    _endpoint = "apod"
+
     def __init__(
-        self, api_key="DEMO_KEY", session=None, rate_limiter=default_rate_limiter
+        self,
+        api_key="DEMO_KEY",
+        session=None,
+        rate_limiter=default_rate_limiter,
+        **kwargs,
     ):
         if api_key == "DEMO_KEY" and rate_limiter:
             rate_limiter = demo_rate_limiter
-        super().__init__(api_key, session, rate_limiter)
+        super().__init__(api_key, session, rate_limiter, **kwargs)
 
     async def get(self, date: datetime.date = None, as_json: bool = False):
         """Retrieves a single item from NASA's APOD API.
@@ -46,6 +80,9 @@ class APOD(BaseClient):
             An AstronomyPicture containing data returned by the API.
         """
 
+        # entries for past days never change, so they can be cached indefinitely
+        immutable = date is not None and _is_past(date)
+
         if date is None:  # parameter will be left out of the query.
             date = ""
         else:
@@ -53,18 +90,7 @@ class APOD(BaseClient):
 
         request = f"https://api.nasa.gov/planetary/apod?{date}api_key={self._api_key}"
 
-        if self.rate_limiter:
-            await self.rate_limiter.wait()
-
-        async with self._session.get(request) as response:
-            if response.status != 200:  # not success
-                raise APIException(response.status, response.reason)
-
-            json = await response.json()
-
-        if self.rate_limiter:
-            remaining = int(response.headers["X-RateLimit-Remaining"])
-            self.rate_limiter.update(remaining)
+        json = await self._get_json(request, immutable)
 
         if as_json:
             return json
@@ -96,23 +122,10 @@ class APOD(BaseClient):
             A list of AstronomyPicture objects containing data returned by the API.
         """
 
-        start_date = "start_date=" + start_date.strftime("%Y-%m-%d") + "&"
-        end_date = "end_date=" + end_date.strftime("%Y-%m-%d") + "&"
-
-        request = f"https://api.nasa.gov/planetary/apod?{start_date}{end_date}api_key={self._api_key}"
-
-        if self.rate_limiter:
-            await self.rate_limiter.wait()
-
-        async with self._session.get(request) as response:
-            if response.status != 200:  # not success
-                raise APIException(response.status, response.reason)
-
-            json = await response.json()
+        immutable = _is_past(end_date)
+        request = self._batch_url(start_date, end_date)
 
-        if self.rate_limiter:
-            remaining = int(response.headers["X-RateLimit-Remaining"])
-            self.rate_limiter.update(remaining)
+        json = await self._get_json(request, immutable)
 
         if as_json:
             return json
@@ -129,7 +142,52 @@ class APOD(BaseClient):
                     else None
                 )
 
-                entry = AstronomyPicture(client=self, date=date, json=json)
+                entry = AstronomyPicture(client=self, date=date, json=item)
                 result.append(entry)
 
             return result
+
+    def _batch_url(self, start_date, end_date):
+        start_date = "start_date=" + start_date.strftime("%Y-%m-%d") + "&"
+        end_date = "end_date=" + end_date.strftime("%Y-%m-%d") + "&"
+        return f"https://api.nasa.gov/planetary/apod?{start_date}{end_date}api_key={self._api_key}"
+
+    def plan_batch_get(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        chunk_days: int = BATCH_CHUNK_DAYS,
+        request_time: float = None,
+        concurrency: int = 1,
+    ):
+        """Plans retrieving every entry between two dates, without making any requests.
+
+        The range is split into :meth:`batch_get` calls of at most ``chunk_days`` days. Chunks are aligned
+        to fixed boundaries, so repeating or extending a job reuses cached chunks from earlier runs.
+
+        Parameters
+        ----------
+        start_date: :class:`datetime.Date`
+            The first date to retrieve.
+        end_date: :class:`datetime.Date`
+            The last date to retrieve. Range is inclusive.
+        chunk_days: :class:`int`
+            Maximum number of days per request.
+        request_time: :class:`Optional[float]`
+            Seconds each request is expected to take. Estimated from the client's tracer by default.
+        concurrency: :class:`int`
+            Number of requests the job will run at once.
+
+        Returns
+        -------
+        :class:`Plan`
+            The request count and estimated duration of the job.
+            Its ``chunks`` are ``(start_date, end_date)`` arguments for :meth:`batch_get`.
+        """
+        chunks = aligned_ranges(start_date, end_date, chunk_days, APOD_EPOCH)
+        return plan_requests(
+            self,
+            [(chunk, self._batch_url(*chunk)) for chunk in chunks],
+            request_time,
+            concurrency,
+        )
@@ -48,19 +48,7 @@ class AstronomyPicture(Asset):
 
         super().__init__(client, self.url, self.url.split("/")[-1])
 
-    async def read(self, hdurl: bool = True):
-        """Downloads the image associated with this AstronomyPicture.
-
-        Parameters
-        ----------
-        hdurl: :class:`bool`
-            Indicates that the HD image should be downloaded, if possible.
-
-        Returns
-        -------
-        :class:`bytes`
-            The image, downloaded from the URL provided by the API.
-        """
+    def _image_url(self, hdurl):
         if hdurl:
             url = self.hdurl or self.url
         else:
@@ -73,10 +61,31 @@ class AstronomyPicture(Asset):
             raise NotImplementedError(
                 "URLs from outside apod.nasa.gov are not currently supported."
             )
+        return url
+
+    def _download_url(self, hdurl: bool = True):
+        return self._image_url(hdurl)
+
+    async def read(self, hdurl: bool = True, zero_copy: bool = False):
+        """Downloads the image associated with this AstronomyPicture.
 
-        return await super().read(url)
+        Parameters
+        ----------
+        hdurl: :class:`bool`
+            Indicates that the HD image should be downloaded, if possible.
+        zero_copy: :class:`bool`
+            Whether to return a read-only :class:`memoryview` instead of :class:`bytes`. See :meth:`Asset.read`.
 
-    async def save(self, path=None, hdurl: bool = True):
+        Returns
+        -------
+        :class:`Union[bytes, memoryview]`
+            The image, downloaded from the URL provided by the API.
+        """
+        url = self._image_url(hdurl)
+
+        return await super().read(url, zero_copy)
+
+    async def save(self, path=None, hdurl: bool = True, **kwargs):
         """Downloads the image associated with this AstronomyPicture and saves to a file.
 
         Parameters
@@ -86,21 +95,18 @@ class AstronomyPicture(Asset):
             If ``None``, saves the image to the working directory using the filename from the image url.
         hdurl: :class:`bool`
             Indicates that the HD image should be downloaded, if possible.
-        """
-        if hdurl:
-            url = self.hdurl or self.url
-        else:
-            url = self.url
+        **kwargs:
+            Passed to :meth:`Asset.save`, e.g. ``segments``.
 
-        if not (
-            url.startswith("http://apod.nasa.gov")
-            or url.startswith("https://apod.nasa.gov")
-        ):
-            raise NotImplementedError(
-                "URLs from outside apod.nasa.gov are not currently supported."
-            )
+        Returns
+        -------
+        :class:`Union[int, Tuple[int, str]]`
+            The size of the saved file, in bytes. If a ``digest`` or ``expected_digest`` is passed,
+            a ``(size, hex_digest)`` tuple.
+        """
+        url = self._image_url(hdurl)
 
-        return await super().save(path=path, url=url)
+        return await super().save(path=path, url=url, **kwargs)
 
     async def read_chunk(self, chunk_size: int, hdurl: bool = True):
         """Reads a chunk of the image associated with this AstronomyPicture.
@@ -115,19 +121,28 @@ class AstronomyPicture(Asset):
         Returns
         -------
         :class:`bytes`
-            The chunked data. Will be None if the image has been completely read.
+            The chunked data. Will be empty if the image has been completely read.
         """
-        if hdurl:
-            url = self.hdurl or self.url
-        else:
-            url = self.url
+        url = self._image_url(hdurl)
 
-        if not (
-            url.startswith("http://apod.nasa.gov")
-            or url.startswith("https://apod.nasa.gov")
-        ):
-            raise NotImplementedError(
-                "URLs from outside apod.nasa.gov are not currently supported."
-            )
+        return await super().read_chunk(chunk_size, url)
 
-        await super().read_chunk(chunk_size, self.url)
+    def stream(self, chunk_size=None, hdurl: bool = True, **kwargs):
+        """Streams the image associated with this AstronomyPicture, without holding all of it in memory.
+
+        Parameters
+        ----------
+        chunk_size: :class:`Optional[int]`
+            Maximum size of each chunk, in bytes. By default, chunks are whatever has arrived from the network.
+        hdurl: :class:`bool`
+            Indicates that the HD image should be downloaded, if possible.
+        **kwargs:
+            Passed to :meth:`Asset.stream`, e.g. ``digest``.
+
+        Returns
+        -------
+        :class:`AssetStream`
+            An async iterator over the chunks of the image.
+        """
+        url = self._image_url(hdurl)
+        return super().stream(chunk_size, url, **kwargs)
@@ -1,4 +1,507 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import os
+import time
+
+import aiohttp
+
 from .errors import *
+from .utils import normalize_url
+
+logger = logging.getLogger("aionasa.asset")
+
+# Segmented downloads don't split files into ranges smaller than this.
+MIN_SEGMENT_SIZE = 1024 * 1024
+
+# Smallest and largest buffers written to disk at a time when saving. Between the two, each buffer holds
+# about BUFFER_SECONDS of download, so fast downloads are written in fewer, larger writes.
+CHUNK_SIZE = 64 * 1024
+MAX_BUFFER_SIZE = 4 * 1024 * 1024
+BUFFER_SECONDS = 0.05
+
+
+class _RangesUnsupported(Exception):
+    pass
+
+
+class _Hasher:
+    """Computes several digests of the same data at once."""
+
+    def __init__(self, algorithms):
+        self._hashes = {name: hashlib.new(name) for name in algorithms}
+
+    def update(self, data):
+        for hash in self._hashes.values():
+            hash.update(data)
+
+    def update_file(self, path):
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(MAX_BUFFER_SIZE), b""):
+                self.update(block)
+
+    def digest(self, name):
+        return self._hashes[name].digest()
+
+    def hexdigest(self, name):
+        return self._hashes[name].hexdigest()
+
+
+def _digest_algorithm(digest, expected_digest):
+    """Validates the ``digest`` argument of :meth:`Asset.save`/:meth:`Asset.stream`, defaulting to SHA-256 for ``expected_digest``."""
+    if digest is None and expected_digest:
+        digest = "sha256"
+    if digest is not None and digest not in hashlib.algorithms_available:
+        raise ArgumentError(f"Unsupported digest algorithm: {digest!r}")
+    return digest
+
+
+def _content_md5(headers):
+    """Returns the decoded ``Content-MD5`` header, if the server sent a usable one."""
+    value = headers.get("Content-MD5")
+    if not value or headers.get("Content-Encoding"):
+        # with a Content-Encoding, the checksum is of the encoded body
+        return None
+    try:
+        return base64.b64decode(value, validate=True)
+    except binascii.Error:
+        logger.debug(f"Ignoring malformed Content-MD5 header: {value!r}")
+        return None
+
+
+def _check_digests(hasher, algorithm, expected_digest, content_md5, name):
+    """Compares the digests of a completed download with the expected ones. Returns the requested digest."""
+    if content_md5 is not None and hasher.digest("md5") != content_md5:
+        raise aiohttp.ClientPayloadError(f"Content-MD5 mismatch for {name}.")
+    if algorithm is None:
+        return None
+    digest = hasher.hexdigest(algorithm)
+    if expected_digest and digest != expected_digest.lower():
+        raise DigestMismatch(name, algorithm, expected_digest.lower(), digest)
+    return digest
+
+
+class _PartialDownload:
+    """A download in progress: a ``.part`` file next to the destination, and a JSON manifest describing it."""
+
+    def __init__(self, path, url, algorithm=None, expected_digest=None, verify=True):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.manifest_path = f"{path}.part.json"
+        self.key = normalize_url(url)
+        self.etag = None
+        self.last_modified = None
+        self.content_md5 = None
+        self.size = None
+        self.segments = None  # [start, end, done] for segmented downloads
+        self.algorithm = algorithm
+        self.expected_digest = expected_digest
+        self.verify = verify
+        self.digest = None
+
+    @property
+    def algorithms(self):
+        """Names of the digests to compute while downloading."""
+        algorithms = set()
+        if self.algorithm:
+            algorithms.add(self.algorithm)
+        if self.verify and self.content_md5:
+            algorithms.add("md5")
+        return algorithms
+
+    @property
+    def offset(self):
+        """Number of bytes already downloaded by a single-stream download."""
+        if self.segments is not None or not os.path.exists(self.part_path):
+            return 0
+        return os.path.getsize(self.part_path)
+
+    def load(self):
+        """Loads the manifest of an earlier attempt. Returns whether there is a download to resume."""
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if manifest.get("url") != self.key or not os.path.exists(self.part_path):
+            self.discard()
+            return False
+        self.etag = manifest.get("etag")
+        self.last_modified = manifest.get("last_modified")
+        self.content_md5 = manifest.get("content_md5")
+        self.size = manifest.get("size")
+        self.segments = manifest.get("segments")
+        return True
+
+    def save(self):
+        manifest = {
+            "url": self.key,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "content_md5": self.content_md5,
+            "size": self.size,
+            "segments": self.segments,
+        }
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def start(self, headers, size):
+        """Records the validators of a download starting from the beginning of the file."""
+        headers = headers or {}
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+        content_md5 = _content_md5(headers)
+        self.content_md5 = (
+            base64.b64encode(content_md5).decode() if content_md5 else None
+        )
+        self.size = size
+        self.segments = None
+        self.save()
+
+    def validator(self):
+        """Returns the value for an ``If-Range`` header, if the server sent a usable validator."""
+        if self.etag and not self.etag.startswith(
+            "W/"
+        ):  # weak ETags can't be used with If-Range
+            return self.etag
+        return self.last_modified
+
+    def matches(self, headers, size):
+        """Returns whether the server's current headers describe the same file as the partial download."""
+        headers = headers or {}
+        if size is not None and self.size is not None and size != self.size:
+            return False
+        etag = headers.get("ETag")
+        if self.etag and etag:
+            return etag == self.etag
+        last_modified = headers.get("Last-Modified")
+        if self.last_modified and last_modified:
+            return last_modified == self.last_modified
+        return True
+
+    def finish(self, hasher=None):
+        """Checks the size and digests of the downloaded file, then moves it into place. Returns its size."""
+        size = os.path.getsize(self.part_path)
+        expected_size = self.size
+        if expected_size is not None and size != expected_size:
+            if size > expected_size:
+                self.discard()
+            raise aiohttp.ClientPayloadError(
+                f"Expected {expected_size} bytes for {self.path}, got {size}."
+            )
+        if hasher is not None:
+            content_md5 = (
+                base64.b64decode(self.content_md5)
+                if self.verify and self.content_md5
+                else None
+            )
+            try:
+                self.digest = _check_digests(
+                    hasher, self.algorithm, self.expected_digest, content_md5, self.path
+                )
+            except (aiohttp.ClientPayloadError, DigestMismatch):
+                # resuming a corrupt file would only keep the corruption
+                self.discard()
+                raise
+        os.replace(self.part_path, self.path)
+        self._remove(self.manifest_path)
+        return size
+
+    def discard(self):
+        """Deletes the partial download."""
+        self._remove(self.part_path)
+        self._remove(self.manifest_path)
+        self.etag = self.last_modified = self.content_md5 = None
+        self.size = self.segments = None
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+async def _buffered(content):
+    """Yields a response body as lists of chunks, each list sized to hold about ``BUFFER_SECONDS`` of download."""
+    buffer = []
+    buffered = 0
+    target = CHUNK_SIZE
+    started = time.monotonic()
+    async for chunk in content.iter_any():
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= target:
+            elapsed = time.monotonic() - started
+            rate = (
+                buffered / elapsed if elapsed > 0 else MAX_BUFFER_SIZE / BUFFER_SECONDS
+            )
+            target = int(min(MAX_BUFFER_SIZE, max(CHUNK_SIZE, rate * BUFFER_SECONDS)))
+            yield buffer
+            buffer = []
+            buffered = 0
+            started = time.monotonic()
+    if buffer:
+        yield buffer
+
+
+async def _read_into(response):
+    """Reads a response body into a buffer preallocated from its ``Content-Length``. Returns a memoryview of it."""
+    size = response.content_length
+    if size is None or response.headers.get("Content-Encoding"):
+        # the decoded size isn't known up front
+        buffer = bytearray()
+        async for chunk in response.content.iter_any():
+            buffer += chunk
+        return memoryview(buffer)
+
+    view = memoryview(bytearray(size))
+    offset = 0
+    async for chunk in response.content.iter_any():
+        end = offset + len(chunk)
+        if end > size:
+            raise aiohttp.ClientPayloadError(
+                f"Received more than the {size} bytes announced by the server."
+            )
+        view[offset:end] = chunk
+        offset = end
+    if offset != size:
+        raise aiohttp.ClientPayloadError(f"Expected {size} bytes, got {offset}.")
+    return view
+
+
+class _FileWriter:
+    """Writes to a file from a worker thread, so the event loop keeps receiving data while the disk catches up.
+
+    Writes happen in order; at most one is in progress while the next buffer is being received.
+    """
+
+    def __init__(self, path, mode, offset=None, progress=None, hasher=None):
+        self.path = path
+        self.mode = mode
+        self.offset = offset
+        self.progress = progress
+        self.hasher = hasher
+        self.bytes_written = 0
+        self._file = None
+        self._pending = None
+        self._loop = None
+
+    async def __aenter__(self):
+        self._loop = asyncio.get_running_loop()
+        self._file = await self._loop.run_in_executor(None, self._open)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self._wait()
+        finally:
+            await self._loop.run_in_executor(None, self._file.close)
+
+    def _open(self):
+        f = open(self.path, self.mode)
+        if self.offset is not None:
+            f.seek(self.offset)
+        return f
+
+    def _write(self, chunks):
+        self._file.writelines(chunks)
+        if self.hasher is not None:
+            # hashed in the same worker thread, while the next buffer is received
+            for chunk in chunks:
+                self.hasher.update(chunk)
+
+    async def _wait(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            try:
+                await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # a write can't be interrupted, so it's finished before the file is closed or reused
+                await asyncio.wait([pending])
+                raise
+
+    async def write(self, chunks):
+        """Queues a list of chunks to be written after the previous write completes."""
+        await self._wait()
+        self._pending = self._loop.run_in_executor(None, self._write, chunks)
+        size = sum(len(chunk) for chunk in chunks)
+        self.bytes_written += size
+        if self.progress is not None:
+            self.progress(size)
+
+
+class AssetStream:
+    """Async iterator over the body of an asset, as returned by :meth:`Asset.stream`.
+
+    The request is sent when iteration starts. The connection is released as soon as the body has been read,
+    or if iteration fails or is cancelled. To stop early, close the stream with :meth:`aclose`,
+    or use it as an async context manager:
+
+    .. code-block:: python
+
+        async with asset.stream() as chunks:
+            async for chunk in chunks:
+                ...
+
+    With a ``digest`` algorithm, the body is hashed as it is read. Once the whole body has been read,
+    the result is available as :attr:`digest`, and the body has been checked against ``expected_digest``,
+    ``Content-Length`` and ``Content-MD5``. In place of the end of iteration, a mismatch with ``expected_digest``
+    raises :exc:`DigestMismatch`, and a mismatch with the headers :exc:`aiohttp.ClientPayloadError`.
+
+    Attributes
+    ----------
+    bytes_read: :class:`int`
+        Number of bytes read so far.
+    digest: :class:`Optional[str]`
+        Hex digest of the body, once it has been read completely.
+    """
+
+    def __init__(
+        self,
+        client,
+        url,
+        chunk_size=None,
+        digest=None,
+        expected_digest=None,
+        verify=True,
+    ):
+        self.client = client
+        self.url = url
+        self.chunk_size = chunk_size
+        self.algorithm = _digest_algorithm(digest, expected_digest)
+        self.expected_digest = expected_digest
+        self.verify = verify
+        self.bytes_read = 0
+        self.digest = None
+        self._response = None
+        self._iterator = None
+        self._hasher = None
+        self._content_md5 = None
+        self._closed = False
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} url={self.url!r} bytes_read={self.bytes_read}>"
+        )
+
+    def __aiter__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def response(self):
+        """:class:`Optional[aiohttp.ClientResponse]`: The response being read, once the request has been sent."""
+        return self._response
+
+    async def _open(self):
+        response = await self.client._session.get(self.client._resolve(self.url))
+        if response.status != 200:
+            response.release()
+            raise APIException(response.status, response.reason, response.headers)
+        return response
+
+    async def _next(self, size):
+        if self._response is None:
+            self._response = await self.client._with_retries(self._open)
+            algorithms = {self.algorithm} if self.algorithm else set()
+            if self.verify:
+                self._content_md5 = _content_md5(self._response.headers)
+                if self._content_md5 is not None:
+                    algorithms.add("md5")
+            if algorithms:
+                self._hasher = _Hasher(algorithms)
+            content = self._response.content
+            self._iterator = (
+                content.iter_chunked(self.chunk_size)
+                if self.chunk_size
+                else content.iter_any()
+            )
+        if size is not None:
+            return await self._response.content.read(size)
+        return await self._iterator.__anext__()
+
+    def _received(self, chunk):
+        self.bytes_read += len(chunk)
+        if self._hasher is not None:
+            self._hasher.update(chunk)
+
+    def _check(self):
+        """Verifies the complete body."""
+        response = self._response
+        expected_size = (
+            response.content_length
+            if not response.headers.get("Content-Encoding")
+            else None
+        )
+        if (
+            self.verify
+            and expected_size is not None
+            and self.bytes_read != expected_size
+        ):
+            raise aiohttp.ClientPayloadError(
+                f"Expected {expected_size} bytes for {self.url}, got {self.bytes_read}."
+            )
+        if self._hasher is not None:
+            self.digest = _check_digests(
+                self._hasher,
+                self.algorithm,
+                self.expected_digest,
+                self._content_md5,
+                self.url,
+            )
+
+    async def __anext__(self):
+        if self._closed:
+            raise StopAsyncIteration
+        try:
+            chunk = await self._next(None)
+        except StopAsyncIteration:
+            self.close()
+            self._check()
+            raise
+        except BaseException:
+            # an error or cancellation: either way the connection is no longer needed
+            self.close()
+            raise
+        self._received(chunk)
+        return chunk
+
+    async def read(self, size):
+        """Reads up to ``size`` bytes. Returns an empty bytes object once the whole file has been read."""
+        if self._closed:
+            return b""
+        try:
+            chunk = await self._next(size)
+        except BaseException:
+            self.close()
+            raise
+        if not chunk:
+            self.close()
+            self._check()
+        self._received(chunk)
+        return chunk
+
+    def close(self):
+        """Stops the download and releases its connection."""
+        self._closed = True
+        if self._response is not None:
+            # release() keeps the connection for reuse if the whole body was read, and closes it otherwise
+            self._response.release()
+
+    async def aclose(self):
+        """Stops the download and releases its connection."""
+        self.close()
 
 
 class Asset:
@@ -8,37 +511,121 @@ class Asset:
         self.client = client
         self._url = url
         self.filename = filename
-        self._response = None
+        self._chunk_streams = {}
 
     def __str__(self):
         return f"{self.__class__.__name__}({self.filename})"
 
-    async def read(self, url=None):
+    def _download_url(self, url=None):
+        """The URL :meth:`save` downloads from, given the same options. Used by :class:`DownloadManager`."""
+        return url or self._url
+
+    async def read(self, url=None, zero_copy=False):
         """Downloads the file associated with this Asset.
 
+        If the client has an :class:`AssetCache`, the stored copy of the file is used while it is current,
+        and downloaded files are added to it.
+
         Parameters
         ----------
         url: :class:`str`
             The URL to download the asset from, for subclasses with multiple options.
+        zero_copy: :class:`bool`
+            Whether to return a read-only :class:`memoryview` instead of :class:`bytes`. A file in the client's
+            :class:`AssetCache` is memory-mapped rather than copied into memory, so concurrent reads of the same
+            file share the OS page cache. Downloads are read into a buffer allocated once from ``Content-Length``.
 
         Returns
         -------
-        :class:`bytes`
+        :class:`Union[bytes, memoryview]`
             The file, downloaded from the URL.
         """
         if not url:
             url = self._url
 
-        async with self.client._session.get(url) as response:
+        if self.client.asset_cache is not None:
+            return await self.client._with_retries(self._read_cached, url, zero_copy)
+        return await self.client._with_retries(self._read, url, zero_copy)
+
+    async def _read(self, url, zero_copy=False):
+        async with self.client._session.get(self.client._resolve(url)) as response:
             if response.status != 200:
-                raise APIException(response.status, response.reason)
+                raise APIException(response.status, response.reason, response.headers)
+            if zero_copy:
+                return (await _read_into(response)).toreadonly()
             image = await response.read()
 
         return image
 
-    async def save(self, path=None, url=None):
+    async def _read_cached(self, url, zero_copy=False):
+        cache = self.client.asset_cache
+        key = normalize_url(url)
+        entry = cache.get(key)
+        if entry is not None and cache.fresh(entry):
+            image = await self._load_cached(entry, zero_copy)
+            if image is not None:
+                return image
+            entry = None
+
+        headers = entry.conditional_headers() if entry is not None else {}
+        async with self.client._session.get(
+            self.client._resolve(url), headers=headers
+        ) as response:
+            if entry is not None and response.status == 304:
+                cache.revalidated(entry, response.headers)
+            elif response.status != 200:
+                raise APIException(response.status, response.reason, response.headers)
+            elif zero_copy:
+                entry = None
+                image = await _read_into(response)
+            else:
+                entry = None
+                image = await response.read()
+
+        if entry is not None:
+            image = await self._load_cached(entry, zero_copy)
+            if image is None:
+                # the stored file went missing after the server confirmed it
+                image = await self._read(url, zero_copy)
+            return image
+
+        await asyncio.get_running_loop().run_in_executor(
+            None, cache.put, key, image, response.headers
+        )
+        return image.toreadonly() if zero_copy else image
+
+    async def _load_cached(self, entry, zero_copy):
+        cache = self.client.asset_cache
+        if zero_copy:
+            # mapping the file is cheap, unlike reading it into memory
+            return cache.map(entry)
+        return await asyncio.get_running_loop().run_in_executor(None, cache.read, entry)
+
+    async def save(
+        self,
+        path=None,
+        url=None,
+        segments=1,
+        resume=True,
+        progress=None,
+        digest=None,
+        expected_digest=None,
+        verify=True,
+    ):
         """Downloads the file associated with this Asset and saves to the requested path.
 
+        The file is downloaded to ``<path>.part`` and moved to ``path`` once complete. If the download
+        fails, the partial file is kept along with a small ``<path>.part.json`` manifest, and the next
+        attempt (including retries by the client's :class:`RetryPolicy`) resumes where it stopped using
+        a ``Range`` request. The ``ETag``/``Last-Modified`` validators and size recorded in the manifest
+        make sure a file that changed on the server in the meantime is downloaded again from the start.
+
+        The size of the file is checked against ``Content-Length``, and against ``Content-MD5`` if the server
+        sends one, before it is moved into place. A file that fails these checks is discarded.
+
+        If the client has an :class:`AssetCache`, the stored copy of the file is used while it is current,
+        and downloaded files are added to it.
+
         Parameters
         ----------
         url: :class:`str`
@@ -46,40 +633,363 @@ class Asset:
         path:
             The file path at which to save the file.
             If ``None``, saves the image to the working directory using the filename from the asset url.
+        segments: :class:`int`
+            Number of byte ranges to download concurrently. Splitting a large file over several connections
+            speeds up downloads on high-latency links. If the server doesn't accept range requests,
+            or the file is too small to split, it is downloaded over a single connection.
+        resume: :class:`bool`
+            Whether to resume from a partial download left by an earlier attempt.
+            If ``False``, any partial download is discarded first, and on failure.
+        progress: :class:`Optional[Callable[[int], None]]`
+            Called with the number of bytes received each time a buffer is written to disk.
+        digest: :class:`Optional[str]`
+            Name of a :mod:`hashlib` algorithm, e.g. ``'sha256'``, to compute the file's digest with as it is
+            downloaded, instead of reading the file back afterwards. Data downloaded by an earlier attempt, and
+            files downloaded in segments, are hashed from disk once complete.
+        expected_digest: :class:`Optional[str]`
+            Hex digest the file must have to be moved into place. Uses SHA-256 unless ``digest`` is given.
+            A file that doesn't match is discarded and :exc:`DigestMismatch` is raised, without retrying.
+        verify: :class:`bool`
+            Whether to check the file against the server's ``Content-MD5`` header, when it sends one.
+
+        Returns
+        -------
+        :class:`Union[int, Tuple[int, str]]`
+            The size of the saved file, in bytes. If ``digest`` or ``expected_digest`` is given,
+            a ``(size, hex_digest)`` tuple.
         """
         if not url:
             url = self._url
 
+        algorithm = _digest_algorithm(digest, expected_digest)
         path = path if path else f"./{url.split('/')[-1]}"
+        cache = self.client.asset_cache
+        if cache is not None:
+            result = await self.client._with_retries(
+                self._save_cached, path, url, algorithm, expected_digest
+            )
+            if result is not None:
+                return result if algorithm else result[0]
 
-        async with self.client._session.get(url) as response:
-            if response.status != 200:
-                raise APIException(response.status, response.reason)
-            with open(path, "wb") as f:
-                bytes_written = 0
-                while True:
-                    chunk = await response.content.read(1000)
-                    bytes_written += len(chunk)
-                    if not chunk:
-                        break
-                    f.write(chunk)
-
-        return bytes_written
+        download = _PartialDownload(path, url, algorithm, expected_digest, verify)
+        if not resume:
+            download.discard()
+
+        try:
+            size = await self.client._with_retries(
+                self._save, download, url, segments, progress
+            )
+        except BaseException:
+            if not resume:
+                download.discard()
+            raise
+
+        if cache is not None:
+            headers = {"ETag": download.etag, "Last-Modified": download.last_modified}
+            sha256 = download.digest if algorithm == "sha256" else None
+            await asyncio.get_running_loop().run_in_executor(
+                None, cache.put_file, download.key, path, headers, sha256
+            )
+        return (size, download.digest) if algorithm else size
+
+    async def _save_cached(self, path, url, algorithm=None, expected_digest=None):
+        """Copies the file from the client's asset cache to ``path`` if it is still current.
+        Returns its size and digest, or ``None``."""
+        cache = self.client.asset_cache
+        entry = cache.get(normalize_url(url))
+        if entry is None:
+            return None
+
+        if not cache.fresh(entry):
+            # only the headers are needed: if the file changed, it is downloaded (resumably) by save()
+            async with self.client._session.head(
+                self.client._resolve(url),
+                headers=entry.conditional_headers(),
+                allow_redirects=True,
+            ) as response:
+                etag = response.headers.get("ETag")
+                if response.status == 304 or (
+                    response.status == 200
+                    and etag
+                    and not etag.startswith("W/")
+                    and etag == entry.etag
+                ):
+                    cache.revalidated(entry, response.headers)
+                else:
+                    return None
+
+        loop = asyncio.get_running_loop()
+        digest = None
+        if algorithm == "sha256":
+            # stored files are named by their SHA-256
+            digest = entry.digest
+        elif algorithm is not None:
+            hasher = _Hasher([algorithm])
+            try:
+                await loop.run_in_executor(None, hasher.update_file, entry.path)
+            except FileNotFoundError:
+                return None
+            digest = hasher.hexdigest(algorithm)
+        if expected_digest and digest != expected_digest.lower():
+            logger.debug(f"Stored copy of {url} doesn't match expected_digest.")
+            return None
+
+        size = await loop.run_in_executor(None, cache.copy, entry, path)
+        if size is None:
+            return None
+        return size, digest
+
+    async def _save(self, download, url, segments, progress=None):
+        resuming = download.load()
+        if resuming:
+            logger.debug(f"Resuming download of {url} into {download.part_path}")
+
+        if download.segments is not None or (segments > 1 and not resuming):
+            headers = await self._probe(url)
+            size = headers and headers.get("Content-Length")
+            size = int(size) if size else 0
+            if download.segments is not None and not download.matches(headers, size):
+                logger.debug(f"{url} changed since the partial download, restarting.")
+                download.discard()
+            if download.segments is None:
+                segments = min(segments, size // MIN_SEGMENT_SIZE)
+            if download.segments is not None or segments > 1:
+                try:
+                    return await self._save_segmented(
+                        download, url, headers, size, segments, progress
+                    )
+                except _RangesUnsupported:
+                    logger.debug(
+                        f"Range request to {url} was not honoured, downloading as a single stream."
+                    )
+                    download.discard()
+
+        return await self._save_stream(download, url, progress)
+
+    async def _save_stream(self, download, url, progress=None):
+        offset = download.offset
+        # byte ranges and the recorded size only line up with the file if it isn't sent compressed
+        headers = {"Accept-Encoding": "identity"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            validator = download.validator()
+            if validator:
+                # the server sends the whole file instead of the range if it changed
+                headers["If-Range"] = validator
+
+        async with self.client._session.get(
+            self.client._resolve(url), headers=headers
+        ) as response:
+            if (
+                offset
+                and response.status == 416
+                and download.size == offset
+                and download.matches(response.headers, None)
+            ):
+                # the previous attempt got everything, but failed before moving the file into place
+                return await self._finish(download)
+            content_range = response.headers.get("Content-Range", "")
+            total = content_range.rpartition("/")[2]
+            if response.status == 206 and (
+                (
+                    download.size is not None
+                    and total.isdigit()
+                    and int(total) != download.size
+                )
+                or not download.matches(response.headers, None)
+            ):
+                # a server that ignores If-Range sends the new file's bytes, which can't be appended to the old ones
+                logger.debug(f"{url} changed since the partial download, restarting.")
+                download.discard()
+                offset, mode = None, None
+            elif response.status == 206 and content_range.startswith(
+                f"bytes {offset}-"
+            ):
+                mode = "ab"
+            elif response.status == 200:
+                offset, mode = 0, "wb"
+                # with a Content-Encoding, Content-Length is the size of the encoded body
+                size = (
+                    response.content_length
+                    if not response.headers.get("Content-Encoding")
+                    else None
+                )
+                download.start(response.headers, size)
+            else:
+                raise APIException(response.status, response.reason, response.headers)
+
+            if mode is not None:
+                algorithms = download.algorithms
+                hasher = _Hasher(algorithms) if algorithms else None
+                if hasher is not None and mode == "ab":
+                    # data from earlier attempts is hashed from disk, the rest as it arrives
+                    await asyncio.get_running_loop().run_in_executor(
+                        None, hasher.update_file, download.part_path
+                    )
+                async with _FileWriter(
+                    download.part_path, mode, progress=progress, hasher=hasher
+                ) as writer:
+                    async for chunks in _buffered(response.content):
+                        await writer.write(chunks)
+
+        if mode is None:
+            return await self._save_stream(download, url, progress)
+        return await self._finish(download, hasher)
+
+    async def _finish(self, download, hasher=None):
+        """Moves a complete download into place, hashing it from disk first if it wasn't hashed as it arrived."""
+        algorithms = download.algorithms
+        if algorithms and hasher is None:
+            hasher = _Hasher(algorithms)
+            await asyncio.get_running_loop().run_in_executor(
+                None, hasher.update_file, download.part_path
+            )
+        return download.finish(hasher)
+
+    async def _probe(self, url):
+        """Returns the headers of the file at ``url`` if the server accepts byte range requests for it, otherwise ``None``."""
+        try:
+            async with self.client._session.head(
+                self.client._resolve(url), allow_redirects=True
+            ) as response:
+                if response.status != 200:
+                    return None
+                if response.headers.get("Accept-Ranges", "").lower() != "bytes":
+                    return None
+                return response.headers
+        except aiohttp.ClientResponseError:
+            return None
+
+    async def _save_segmented(
+        self, download, url, headers, size, segments, progress=None
+    ):
+        if download.segments is None:
+            download.start(headers, size)
+            bounds = [size * i // segments for i in range(segments + 1)]
+            download.segments = [
+                [start, end - 1, False] for start, end in zip(bounds, bounds[1:])
+            ]
+            # preallocate the file, so each segment can be written into place as it arrives
+            with open(download.part_path, "wb") as f:
+                f.truncate(size)
+            download.save()
+
+        async def fetch(segment):
+            start, end, _ = segment
+            await self._save_range(
+                download.part_path, url, start, end, download.validator(), progress
+            )
+            segment[2] = True
+            download.save()
+
+        tasks = [
+            asyncio.ensure_future(fetch(segment))
+            for segment in download.segments
+            if not segment[2]
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # wait for the writes they have in flight, so none land after a fallback, discard or retry
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return await self._finish(download)
+
+    async def _save_range(self, path, url, start, end, validator=None, progress=None):
+        headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+        if validator:
+            headers["If-Range"] = validator
+        async with self.client._session.get(
+            self.client._resolve(url), headers=headers
+        ) as response:
+            if response.status == 200:
+                # the server ignored the range (or the file changed) and is sending the whole file
+                raise _RangesUnsupported()
+            if response.status != 206:
+                raise APIException(response.status, response.reason, response.headers)
+            if not response.headers.get("Content-Range", "").startswith(
+                f"bytes {start}-{end}/"
+            ):
+                raise _RangesUnsupported()
+
+            async with _FileWriter(
+                path, "r+b", offset=start, progress=progress
+            ) as writer:
+                async for chunks in _buffered(response.content):
+                    await writer.write(chunks)
+            bytes_written = writer.bytes_written
+
+        if bytes_written != end - start + 1:
+            raise aiohttp.ClientPayloadError(
+                f"Expected {end - start + 1} bytes for range {start}-{end} of {url}, got {bytes_written}."
+            )
+
+    def stream(
+        self, chunk_size=None, url=None, digest=None, expected_digest=None, verify=True
+    ):
+        """Streams the file associated with this Asset, without holding all of it in memory.
+
+        .. code-block:: python
+
+            async with asset.stream() as chunks:
+                async for chunk in chunks:
+                    ...
+
+        Parameters
+        ----------
+        chunk_size: :class:`Optional[int]`
+            Maximum size of each chunk, in bytes. By default, chunks are whatever has arrived from the network.
+        url: :class:`str`
+            The URL to download the asset from, for subclasses with multiple options.
+        digest: :class:`Optional[str]`
+            Name of a :mod:`hashlib` algorithm to hash the file with as it is read, see :attr:`AssetStream.digest`.
+        expected_digest: :class:`Optional[str]`
+            Hex digest the file must have. Uses SHA-256 unless ``digest`` is given.
+        verify: :class:`bool`
+            Whether to check the file against the server's ``Content-Length`` and ``Content-MD5`` headers.
+
+        Returns
+        -------
+        :class:`AssetStream`
+            An async iterator over the chunks of the file.
+        """
+        if not url:
+            url = self._url
+
+        return AssetStream(
+            self.client, url, chunk_size, digest, expected_digest, verify
+        )
 
     async def read_chunk(self, chunk_size: int, url=None):
+        """Reads the next chunk of the file associated with this Asset.
+        Each URL is read by its own request, which is released once the file has been completely read.
+        :meth:`stream` is usually more convenient.
+
+        Parameters
+        ----------
+        chunk_size: :class:`int`
+            Maximum number of bytes to read.
+        url: :class:`str`
+            The URL to download the asset from, for subclasses with multiple options.
+
+        Returns
+        -------
+        :class:`bytes`
+            The chunked data. Will be empty if the file has been completely read.
+        """
         if not url:
             url = self._url
 
-        if not self._response:
-            response = await self.client._session.get(url)
-            if response.status != 200:
-                await response.close()
-                raise APIException(response.status, response.reason)
-            self._response = response
+        stream = self._chunk_streams.get(url)
+        if stream is None:
+            stream = self._chunk_streams[url] = AssetStream(self.client, url)
 
-        chunk = await self._response.content.read(chunk_size)
+        try:
+            chunk = await stream.read(chunk_size)
+        except BaseException:
+            self._chunk_streams.pop(url, None)
+            raise
         if not chunk:
-            await self._response.close()
-            self._response = None
-
+            self._chunk_streams.pop(url, None)
         return chunk
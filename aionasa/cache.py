@@ -0,0 +1,899 @@
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger("aionasa.cache")
+
+# number of cache hits whose access times SQLiteCache holds before writing them
+ACCESS_BATCH_SIZE = 256
+
+
+class ResponseCache:
+    """In-memory cache for API responses, shared by any number of clients.
+
+    Entries are keyed by normalized request URL (see :func:`aionasa.utils.normalize_url`),
+    expire after a per-endpoint TTL, and are evicted least-recently-used first once either
+    the entry count or total byte size limit is exceeded.
+
+    Parameters
+    ----------
+    max_entries: :class:`int`
+        Maximum number of responses to hold.
+    max_bytes: :class:`int`
+        Maximum combined size of all cached response bodies, in bytes.
+    ttl: :class:`Optional[float]`
+        Default number of seconds a response stays fresh. ``None`` means responses never expire.
+    ttls: :class:`Optional[dict]`
+        Per-endpoint TTL overrides, keyed by endpoint name
+        (``'apod'``, ``'epic'``, ``'neows'``, ``'exoplanet'``, ``'insight'``).
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        Number of lookups that returned a cached response.
+    misses: :class:`int`
+        Number of lookups that found no fresh response.
+    evictions: :class:`int`
+        Number of entries removed to stay within ``max_entries``/``max_bytes``.
+    """
+
+    def __init__(
+        self, max_entries=1024, max_bytes=32 * 1024 * 1024, ttl=300, ttls=None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (expires, body)
+        self._nbytes = 0
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} entries={len(self)} bytes={self._nbytes} "
+            f"hits={self.hits} misses={self.misses} evictions={self.evictions}>"
+        )
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    @property
+    def nbytes(self):
+        """:class:`int`: Combined size of all cached response bodies, in bytes."""
+        return self._nbytes
+
+    @property
+    def stats(self):
+        """:class:`dict`: Snapshot of the cache counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "bytes": self._nbytes,
+        }
+
+    def ttl_for(self, endpoint):
+        """Returns the TTL used for responses from the given endpoint."""
+        return self.ttls.get(endpoint, self.ttl)
+
+    @staticmethod
+    def _expired(entry):
+        expires = entry[0]
+        return expires is not None and expires <= time.monotonic()
+
+    def get(self, key):
+        """Looks up a cached response body.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The normalized request URL.
+
+        Returns
+        -------
+        :class:`Optional[bytes]`
+            The cached response body, or ``None`` if nothing fresh is cached.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if self._expired(entry):
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, body, endpoint=None, immutable=False):
+        """Stores a response body.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The normalized request URL.
+        body: :class:`bytes`
+            The raw response body.
+        endpoint: :class:`Optional[str]`
+            Name of the endpoint the response came from, used to pick its TTL.
+        immutable: :class:`bool`
+            Marks data that will never change (e.g. APOD entries for past days).
+            Immutable entries never expire, but can still be evicted to stay within size limits.
+        """
+        ttl = None if immutable else self.ttl_for(endpoint)
+        if ttl is not None and ttl <= 0:
+            return
+        if len(body) > self.max_bytes:
+            logger.debug(f"Not caching {key}: body larger than max_bytes.")
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (expires, body)
+        self._nbytes += len(body)
+        self._evict()
+
+    def _remove(self, key):
+        _, body = self._entries.pop(key)
+        self._nbytes -= len(body)
+
+    def _evict(self):
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._nbytes > self.max_bytes
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        """Removes a single entry from the cache, if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self):
+        """Removes every entry from the cache. Counters are left untouched."""
+        self._entries.clear()
+        self._nbytes = 0
+
+
+class SQLiteCache:
+    """Persistent response cache stored in a local SQLite database.
+
+    Accepts the same calls as :class:`ResponseCache`, so it can be passed as the ``cache``
+    argument of any client. Response bodies are stored zlib-compressed along with the time they
+    were fetched, so cached data survives restarts.
+
+    Entries marked immutable (such as APOD entries for past days or EPIC archive dates) never
+    expire. When the cache grows past ``max_entries`` or ``max_bytes``, expiring entries are evicted
+    least-recently-used first, and immutable entries are only evicted once none of those are left.
+    Cache hits update an entry's access time in memory; the times are written to the database in batches.
+    The cache may be shared between threads.
+
+    Parameters
+    ----------
+    path: :class:`str`
+        Location of the database file. Created if it does not exist.
+    max_entries: :class:`int`
+        Maximum number of responses to hold.
+    max_bytes: :class:`int`
+        Maximum combined size of all stored (compressed) response bodies, in bytes.
+    ttl: :class:`Optional[float]`
+        Default number of seconds a response stays fresh. ``None`` means responses never expire.
+    ttls: :class:`Optional[dict]`
+        Per-endpoint TTL overrides, keyed by endpoint name.
+    compression_level: :class:`int`
+        zlib compression level used for stored bodies.
+    """
+
+    def __init__(
+        self,
+        path="aionasa_cache.sqlite3",
+        max_entries=100_000,
+        max_bytes=512 * 1024 * 1024,
+        ttl=3600,
+        ttls=None,
+        compression_level=6,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self.compression_level = compression_level
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # clients of the sync facade may share the cache from several threads
+        self._mutex = threading.RLock()
+        # access times of cache hits, written in batches instead of one UPDATE per hit
+        self._accessed = {}
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, "
+            "body BLOB NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "endpoint TEXT, "
+            "fetched_at REAL NOT NULL, "
+            "expires_at REAL, "
+            "accessed_at REAL NOT NULL, "
+            "immutable INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_eviction "
+            "ON responses (immutable, accessed_at)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_expiry ON responses (expires_at)"
+        )
+        # running totals, so writes don't have to scan the table to check the limits
+        self._count, self._nbytes = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} path={self.path!r} entries={len(self)} "
+            f"hits={self.hits} misses={self.misses} evictions={self.evictions}>"
+        )
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, key):
+        with self._mutex:
+            row = self._db.execute(
+                "SELECT expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and (row[0] is None or row[0] > time.time())
+
+    @property
+    def nbytes(self):
+        """:class:`int`: Combined size of all stored (compressed) response bodies, in bytes."""
+        return self._nbytes
+
+    @property
+    def stats(self):
+        """:class:`dict`: Snapshot of the cache counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "bytes": self.nbytes,
+        }
+
+    def ttl_for(self, endpoint):
+        """Returns the TTL used for responses from the given endpoint."""
+        return self.ttls.get(endpoint, self.ttl)
+
+    def fetched_at(self, key):
+        """Returns the UNIX timestamp at which the given entry was fetched, or ``None`` if it is not cached."""
+        with self._mutex:
+            row = self._db.execute(
+                "SELECT fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, key):
+        """Looks up a cached response body.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The normalized request URL.
+
+        Returns
+        -------
+        :class:`Optional[bytes]`
+            The cached response body, or ``None`` if nothing fresh is cached.
+        """
+        now = time.time()
+        with self._mutex:
+            row = self._db.execute(
+                "SELECT body, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            body, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self.invalidate(key)
+                self.misses += 1
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= ACCESS_BATCH_SIZE:
+                self._flush_accessed()
+            self.hits += 1
+        return zlib.decompress(body)
+
+    def set(self, key, body, endpoint=None, immutable=False):
+        """Stores a response body.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The normalized request URL.
+        body: :class:`bytes`
+            The raw response body.
+        endpoint: :class:`Optional[str]`
+            Name of the endpoint the response came from, used to pick its TTL.
+        immutable: :class:`bool`
+            Marks data that will never change. Immutable entries never expire.
+        """
+        ttl = None if immutable else self.ttl_for(endpoint)
+        if ttl is not None and ttl <= 0:
+            return
+        compressed = zlib.compress(body, self.compression_level)
+        if len(compressed) > self.max_bytes:
+            logger.debug(f"Not caching {key}: body larger than max_bytes.")
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        with self._mutex:
+            self._accessed.pop(key, None)
+            self._forget(key)
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, body, size, endpoint, fetched_at, expires_at, accessed_at, immutable) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    compressed,
+                    len(compressed),
+                    endpoint,
+                    now,
+                    expires_at,
+                    now,
+                    int(immutable),
+                ),
+            )
+            self._count += 1
+            self._nbytes += len(compressed)
+            self._evict()
+
+    def _forget(self, key):
+        """Takes an entry about to be replaced or deleted out of the running totals."""
+        row = self._db.execute(
+            "SELECT size FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._count -= 1
+            self._nbytes -= row[0]
+
+    def _flush_accessed(self):
+        """Writes pending access times in a single transaction."""
+        if not self._accessed:
+            return
+        updates = [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+        self._accessed.clear()
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", updates
+            )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _evict(self):
+        if self._count <= self.max_entries and self._nbytes <= self.max_bytes:
+            return
+
+        # drop anything already expired before touching live entries
+        now = time.time()
+        removed, size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses "
+            "WHERE expires_at IS NOT NULL AND expires_at <= ?",
+            (now,),
+        ).fetchone()
+        if removed:
+            self._db.execute(
+                "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            )
+            self._count -= removed
+            self._nbytes -= size
+            self.evictions += removed
+        count, total = self._count, self._nbytes
+
+        # least-recently-used order depends on the access times that haven't been written yet
+        self._flush_accessed()
+        rows = self._db.execute(
+            "SELECT key, size FROM responses ORDER BY immutable, accessed_at"
+        )
+        victims = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", victims)
+        self._count, self._nbytes = count, total
+        self.evictions += len(victims)
+
+    def invalidate(self, key):
+        """Removes a single entry from the cache, if present."""
+        with self._mutex:
+            self._accessed.pop(key, None)
+            self._forget(key)
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        """Removes every entry from the cache. Counters are left untouched."""
+        with self._mutex:
+            self._accessed.clear()
+            self._db.execute("DELETE FROM responses")
+            self._count = self._nbytes = 0
+
+    def close(self):
+        """Writes any pending access times and closes the underlying database connection."""
+        with self._mutex:
+            self._flush_accessed()
+            self._db.close()
+
+
+class AssetCacheEntry:
+    """A file stored in an :class:`AssetCache`.
+
+    Attributes
+    ----------
+    key: :class:`str`
+        The normalized URL the file was downloaded from.
+    digest: :class:`str`
+        SHA-256 of the file's contents. URLs serving identical files share one stored copy.
+    size: :class:`int`
+        Size of the file, in bytes.
+    etag: :class:`Optional[str]`
+        The ``ETag`` the server sent with the file.
+    last_modified: :class:`Optional[str]`
+        The ``Last-Modified`` date the server sent with the file.
+    validated_at: :class:`float`
+        UNIX timestamp of the last time the server confirmed the file was current.
+    path: :class:`str`
+        Location of the stored file.
+    """
+
+    __slots__ = (
+        "key",
+        "digest",
+        "size",
+        "etag",
+        "last_modified",
+        "validated_at",
+        "path",
+    )
+
+    def __init__(self, key, digest, size, etag, last_modified, validated_at, path):
+        self.key = key
+        self.digest = digest
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.validated_at = validated_at
+        self.path = path
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} key={self.key!r} digest={self.digest[:12]} size={self.size}>"
+
+    def conditional_headers(self):
+        """Returns the ``If-None-Match``/``If-Modified-Since`` headers to revalidate this file with."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class AssetCache:
+    """Local store for asset files (images), used by :meth:`Asset.read` and :meth:`Asset.save`.
+
+    Pass an AssetCache as the ``asset_cache`` argument of any client. Files are keyed by normalized URL
+    (see :func:`aionasa.utils.normalize_url`, which drops the API key), and stored once per distinct content,
+    named by their SHA-256 digest. Once a file is older than ``ttl``, it is revalidated with a conditional
+    request using the ``ETag``/``Last-Modified`` sent with it, and only downloaded again if it changed.
+    When the stored files grow past ``max_bytes``, the least recently used ones are evicted.
+    Lookups update an entry's access time in memory; the times are written to the index in batches.
+
+    Parameters
+    ----------
+    directory: :class:`str`
+        Directory holding the stored files and their index. Created if it does not exist.
+    max_bytes: :class:`int`
+        Maximum combined size of the stored files, in bytes. Files shared by several URLs count once.
+    ttl: :class:`Optional[float]`
+        Number of seconds a file is used without revalidating it. ``None`` means files are never revalidated,
+        ``0`` that they are revalidated on every use.
+
+    Attributes
+    ----------
+    hits: :class:`int`
+        Number of times a stored file was used, including after revalidating it.
+    misses: :class:`int`
+        Number of times a file had to be downloaded.
+    revalidations: :class:`int`
+        Number of stored files the server confirmed were still current.
+    evictions: :class:`int`
+        Number of entries removed to stay within ``max_bytes``.
+    """
+
+    def __init__(self, directory="aionasa_assets", max_bytes=1024**3, ttl=3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        # files are written from worker threads, so the index is shared between threads
+        self._mutex = threading.RLock()
+        # access times of lookups, written in batches instead of one UPDATE per lookup
+        self._accessed = {}
+        self._db = sqlite3.connect(
+            os.path.join(directory, "index.sqlite3"),
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, "
+            "digest TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "validated_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS entries_digest ON entries (digest)"
+        )
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} directory={self.directory!r} entries={len(self)} "
+            f"hits={self.hits} misses={self.misses} evictions={self.evictions}>"
+        )
+
+    def __len__(self):
+        with self._mutex:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key):
+        with self._mutex:
+            row = self._db.execute(
+                "SELECT 1 FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None
+
+    @property
+    def nbytes(self):
+        """:class:`int`: Combined size of the stored files, in bytes."""
+        with self._mutex:
+            return self._nbytes()
+
+    def _nbytes(self):
+        return self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+        ).fetchone()[0]
+
+    @property
+    def stats(self):
+        """:class:`dict`: Snapshot of the cache counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "bytes": self.nbytes,
+        }
+
+    def _object_path(self, digest):
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def get(self, key):
+        """Looks up a stored file.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The normalized URL.
+
+        Returns
+        -------
+        :class:`Optional[AssetCacheEntry]`
+            The stored file, or ``None`` if there is none. It may need revalidating first, see :meth:`fresh`.
+            The file itself isn't checked: :meth:`read`, :meth:`map` and :meth:`copy` drop the entry
+            if it has gone missing.
+        """
+        with self._mutex:
+            row = self._db.execute(
+                "SELECT digest, size, etag, last_modified, validated_at FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_BATCH_SIZE:
+                self._flush_accessed()
+        digest, size, etag, last_modified, validated_at = row
+        return AssetCacheEntry(
+            key,
+            digest,
+            size,
+            etag,
+            last_modified,
+            validated_at,
+            self._object_path(digest),
+        )
+
+    def fresh(self, entry):
+        """Returns whether a stored file can be used without revalidating it."""
+        return self.ttl is None or entry.validated_at + self.ttl > time.time()
+
+    def revalidated(self, entry, headers=None):
+        """Records that the server confirmed a stored file is current, e.g. with a ``304 Not Modified`` response.
+
+        Parameters
+        ----------
+        entry: :class:`AssetCacheEntry`
+            The stored file.
+        headers: :class:`Optional[Mapping[str, str]]`
+            The response headers, which may carry updated validators.
+        """
+        headers = headers or {}
+        entry.etag = headers.get("ETag") or entry.etag
+        entry.last_modified = headers.get("Last-Modified") or entry.last_modified
+        entry.validated_at = time.time()
+        self.revalidations += 1
+        with self._mutex:
+            self._db.execute(
+                "UPDATE entries SET etag = ?, last_modified = ?, validated_at = ? WHERE key = ?",
+                (entry.etag, entry.last_modified, entry.validated_at, entry.key),
+            )
+
+    def put(self, key, body, headers=None):
+        """Stores a file downloaded into memory. Blocks while the file is written.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The normalized URL.
+        body: :class:`bytes`
+            The file's contents.
+        headers: :class:`Optional[Mapping[str, str]]`
+            The response headers, for the ``ETag``/``Last-Modified`` validators.
+        """
+        self.misses += 1
+        if len(body) > self.max_bytes:
+            logger.debug(f"Not caching {key}: file larger than max_bytes.")
+            return
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            self._write_object(path, lambda f: f.write(body))
+        self._add(key, digest, len(body), headers)
+
+    def put_file(self, key, source, headers=None, digest=None):
+        """Stores a copy of a file downloaded to disk. Blocks while the file is hashed and copied.
+
+        Parameters
+        ----------
+        key: :class:`str`
+            The normalized URL.
+        source: :class:`str`
+            Path of the downloaded file.
+        headers: :class:`Optional[Mapping[str, str]]`
+            The response headers, for the ``ETag``/``Last-Modified`` validators.
+        digest: :class:`Optional[str]`
+            SHA-256 hex digest of the file, if it is already known.
+        """
+        self.misses += 1
+        size = os.path.getsize(source)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key}: file larger than max_bytes.")
+            return
+        if digest is None:
+            sha256 = hashlib.sha256()
+            with open(source, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(block)
+            digest = sha256.hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            with open(source, "rb") as src:
+                self._write_object(path, lambda f: shutil.copyfileobj(src, f))
+        self._add(key, digest, size, headers)
+
+    @staticmethod
+    def _write_object(path, write):
+        # written under a temporary name, so a stored file is never seen half-written
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _add(self, key, digest, size, headers):
+        headers = headers or {}
+        now = time.time()
+        with self._mutex:
+            self._accessed.pop(key, None)
+            previous = self._db.execute(
+                "SELECT digest FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(key, digest, size, etag, last_modified, validated_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    digest,
+                    size,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    now,
+                    now,
+                ),
+            )
+            if previous is not None and previous[0] != digest:
+                self._collect(previous[0])
+            self._evict()
+
+    def read(self, entry):
+        """Returns the contents of a stored file, or ``None`` if it has gone missing. Blocks while the file is read."""
+        try:
+            with open(entry.path, "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            self.invalidate(entry.key)
+            return None
+        self.hits += 1
+        return body
+
+    def map(self, entry):
+        """Memory-maps a stored file. Returns a read-only :class:`memoryview` of it, or ``None`` if it has gone missing.
+
+        The file stays mapped until the memoryview (and any slice of it) is garbage collected, even if the entry
+        is evicted in the meantime.
+        """
+        try:
+            with open(entry.path, "rb") as f:
+                if entry.size == 0:
+                    view = memoryview(b"")
+                else:
+                    view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            self.invalidate(entry.key)
+            return None
+        self.hits += 1
+        return view
+
+    def copy(self, entry, path):
+        """Copies a stored file to ``path``. Returns its size, or ``None`` if it has gone missing.
+        Blocks while the file is copied."""
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            shutil.copyfile(entry.path, tmp_path)
+        except FileNotFoundError:
+            self.invalidate(entry.key)
+            return None
+        os.replace(tmp_path, path)
+        self.hits += 1
+        return entry.size
+
+    def _collect(self, digest):
+        """Deletes a stored file once no entry refers to it."""
+        row = self._db.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if row is None:
+            try:
+                os.remove(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # e.g. on Windows, while the file is still memory-mapped
+                logger.debug(f"Could not remove stored file {digest}: {e}")
+
+    def _remove(self, key):
+        self._accessed.pop(key, None)
+        row = self._db.execute(
+            "SELECT digest FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._collect(row[0])
+
+    def _flush_accessed(self):
+        """Writes pending access times in a single transaction."""
+        if not self._accessed:
+            return
+        updates = [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+        self._accessed.clear()
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", updates
+            )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _evict(self):
+        total = self._nbytes()
+        if total <= self.max_bytes:
+            return
+        # least-recently-used order depends on the access times that haven't been written yet
+        self._flush_accessed()
+        rows = self._db.execute(
+            "SELECT key, digest, size FROM entries ORDER BY accessed_at"
+        ).fetchall()
+        references = {}
+        for _, digest, _ in rows:
+            references[digest] = references.get(digest, 0) + 1
+        for key, digest, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.evictions += 1
+            references[digest] -= 1
+            if not references[digest]:
+                # the stored file only frees space once every URL sharing it is gone
+                total -= size
+                self._collect(digest)
+
+    def invalidate(self, key):
+        """Removes a single entry from the cache, if present."""
+        with self._mutex:
+            self._remove(key)
+
+    def clear(self):
+        """Removes every stored file. Counters are left untouched."""
+        with self._mutex:
+            self._accessed.clear()
+            digests = self._db.execute("SELECT DISTINCT digest FROM entries").fetchall()
+            self._db.execute("DELETE FROM entries")
+            for (digest,) in digests:
+                self._collect(digest)
+
+    def close(self):
+        """Writes any pending access times and closes the index database."""
+        with self._mutex:
+            self._flush_accessed()
+            self._db.close()
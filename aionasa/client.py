@@ -1,32 +1,223 @@
+import asyncio
+import functools
+import json
+import logging
+import time
+
 import aiohttp
 
+from .errors import APIException, ArgumentError
+from .keys import KeyPool
+from .rate_limit import Priority
+from .utils import normalize_url
+
+logger = logging.getLogger("aionasa.client")
+
 
 class BaseClient:
     """
     Base class for NASA API clients.
     """
 
+    #: Name identifying this client's API, used to tag cached responses and metrics.
+    _endpoint = None
+
     def __init__(
-        self, api_key="DEMO_KEY", session=None, rate_limiter=None, timeout=None
+        self,
+        api_key="DEMO_KEY",
+        session=None,
+        rate_limiter=None,
+        timeout=None,
+        transport=None,
+        cache=None,
+        retry_policy=None,
+        tracer=None,
+        redirects=None,
+        priority=Priority.NORMAL,
+        asset_cache=None,
     ):
         """
         Initializes the client class.
 
-        :param api_key: api.nasa.gov key for expanded usage.
-        :param session:
+        :param api_key: api.nasa.gov key for expanded usage, or a KeyPool to spread requests over several keys.
+        :param session: Optional ClientSession to be used for requests made by this client.
+        :param rate_limiter: Optional RateLimiter to be used by this client.
+        :param timeout: Optional ClientTimeout for the session created by this client.
+        :param transport: Optional shared Transport to attach to instead of creating a new session.
+            Its timeout and tracer apply to this client.
+        :param cache: Optional ResponseCache to serve repeated requests from.
+        :param retry_policy: Optional RetryPolicy for retrying failed requests.
+        :param tracer: Optional Tracer that records timing for each request made by this client.
+        :param redirects: Optional mapping of URL prefixes to replacement prefixes, applied to every request
+            made by this client (including asset downloads). Used to point clients at a local stand-in server.
+        :param priority: Priority of this client's requests in its rate limiter, e.g. Priority.BACKGROUND for crawls
+            that should yield to interactive requests sharing the same limiter.
+        :param asset_cache: Optional AssetCache that Asset.read and Asset.save serve repeated downloads from.
         """
         self._api_key = api_key
-        timeout = timeout or aiohttp.ClientTimeout()
-        self._session = session or aiohttp.ClientSession(timeout=timeout)
+        self.key_pool = None
+        if isinstance(api_key, KeyPool):
+            # URLs are built with a placeholder, and the key is picked when each request is sent
+            self._api_key = KeyPool.placeholder
+            self.key_pool = api_key
+        self._transport = None
+        if session:
+            self._session = session
+        elif transport:
+            # the session (and its timeout and trace configs) belongs to the transport
+            if timeout is not None:
+                raise ArgumentError(
+                    "timeout can't be set on a client attached to a Transport, set it on the Transport instead."
+                )
+            if tracer is not None and tracer is not transport.tracer:
+                raise ArgumentError(
+                    "A client attached to a Transport must use the Transport's tracer."
+                )
+            self._transport = transport
+            self._session = transport.acquire()
+        else:
+            timeout = timeout or aiohttp.ClientTimeout()
+            trace_configs = [tracer.trace_config()] if tracer else None
+            self._session = aiohttp.ClientSession(
+                timeout=timeout, trace_configs=trace_configs
+            )
         self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.tracer = tracer
+        self.redirects = dict(redirects or {})
+        self.priority = Priority(priority)
+        self.asset_cache = asset_cache
+        self._inflight = {}
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self._session:
-            await self._session.close()
+        await self.close()
 
     async def close(self):
-        if self._session:
+        if self._transport:
+            transport, self._transport = self._transport, None
+            self._session = None
+            await transport.release()
+        elif self._session:
             await self._session.close()
+
+    def _resolve(self, url):
+        """Applies the client's redirects to a URL, and picks a key for it if the client uses a KeyPool."""
+        if self.key_pool is not None and KeyPool.placeholder in url:
+            # e.g. an asset download, which isn't charged to a rate limiter
+            url = self.key_pool.apply(url, self.key_pool.select()[0])
+        for prefix, target in self.redirects.items():
+            if url.startswith(prefix):
+                return target + url[len(prefix) :]
+        return url
+
+    async def _request(self, url, immutable=False):
+        """Sends a GET request through the client's rate limiter and cache.
+
+        Identical requests made while one is already in flight share its result
+        instead of each making their own network call.
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The URL to request.
+        immutable: :class:`bool`
+            Marks the response as data that will never change, so caches keep it indefinitely.
+
+        Returns
+        -------
+        :class:`bytes`
+            The response body.
+        """
+        key = normalize_url(url)
+        if self.cache is not None:
+            body = self.cache.get(key)
+            if body is not None:
+                logger.debug(f"Cache hit: {key}")
+                return body
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(url, key, immutable))
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._request_done, key))
+        else:
+            logger.debug(f"Joining in-flight request: {key}")
+
+        # shielded so one caller being cancelled doesn't cancel the request for the others
+        return await asyncio.shield(task)
+
+    def _request_done(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # retrieved here in case every caller was cancelled, so it isn't logged as never retrieved
+            task.exception()
+
+    async def _with_retries(self, func, *args):
+        """Calls a coroutine function under the client's retry policy, if it has one."""
+        if self.retry_policy is None:
+            return await func(*args)
+        return await self.retry_policy.run(func, *args)
+
+    async def _fetch(self, url, key, immutable):
+        body = await self._with_retries(self._send, url)
+
+        if self.cache is not None:
+            self.cache.set(key, body, self._endpoint, immutable=immutable)
+
+        return body
+
+    async def _send(self, url, rate_limited=True):
+        rate_limiter = self.rate_limiter if rate_limited else None
+        if self.key_pool is not None and rate_limited and "api_key=" in url:
+            # each key has its own budget, so the key's limiter replaces the client's
+            key, rate_limiter = self.key_pool.select()
+            url = self.key_pool.apply(url, key)
+        trace = self.tracer.start(self._endpoint, url) if self.tracer else None
+        status = None
+
+        try:
+            if rate_limiter:
+                start = time.monotonic()
+                await rate_limiter.wait(self.priority)
+                if trace:
+                    trace.rate_limit_wait = time.monotonic() - start
+
+            kwargs = {"trace_request_ctx": trace} if trace else {}
+            async with self._session.get(self._resolve(url), **kwargs) as response:
+                status = response.status
+
+                if rate_limiter:
+                    remaining = response.headers.get("X-RateLimit-Remaining")
+                    limit = response.headers.get("X-RateLimit-Limit")
+                    if remaining is not None:
+                        rate_limiter.update(
+                            int(remaining), int(limit) if limit else None
+                        )
+
+                if response.status != 200:  # not success
+                    raise APIException(
+                        response.status, response.reason, response.headers
+                    )
+
+                start = time.monotonic()
+                body = await response.read()
+                if trace:
+                    trace.body_read = time.monotonic() - start
+
+        except BaseException as e:
+            if trace:
+                self.tracer.finish(trace, status, e)
+            raise
+
+        if trace:
+            self.tracer.finish(trace, status)
+
+        return body
+
+    async def _get_json(self, url, immutable=False):
+        """Sends a GET request and parses the response body as JSON."""
+        return json.loads(await self._request(url, immutable))
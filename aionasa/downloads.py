@@ -0,0 +1,362 @@
+import asyncio
+import collections
+import logging
+import os
+import posixpath
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .asset import Asset, _digest_algorithm
+from .errors import ArgumentError
+
+logger = logging.getLogger("aionasa.downloads")
+
+
+class DownloadResult:
+    """The outcome of downloading one asset with a :class:`DownloadManager`.
+
+    Attributes
+    ----------
+    asset: :class:`Asset`
+        The asset that was downloaded.
+    path: :class:`Optional[str]`
+        The file the asset was saved to. ``None`` if no URL could be found for it.
+    status: :class:`str`
+        ``'downloaded'``, ``'skipped'`` if the file was already present, or ``'failed'``.
+    size: :class:`int`
+        The size of the file, in bytes. ``0`` for failed downloads.
+    error: :class:`Optional[Exception]`
+        The exception that made the download fail, if it did.
+    elapsed: :class:`float`
+        Seconds spent on this asset, including waiting for retries.
+    digest: :class:`Optional[str]`
+        Hex digest of the downloaded file, if the manager was given a ``digest`` algorithm.
+        ``None`` for skipped files.
+    """
+
+    __slots__ = ("asset", "path", "status", "size", "error", "elapsed", "digest")
+
+    def __init__(
+        self, asset, path, status, size=0, error=None, elapsed=0.0, digest=None
+    ):
+        self.asset = asset
+        self.path = path
+        self.status = status
+        self.size = size
+        self.error = error
+        self.elapsed = elapsed
+        self.digest = digest
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={self.path!r} status={self.status!r} size={self.size}>"
+
+    @property
+    def ok(self):
+        """:class:`bool`: Whether the file is now on disk, whether it was downloaded or skipped."""
+        return self.status != "failed"
+
+
+class DownloadProgress:
+    """A snapshot of a :class:`DownloadManager` job, passed to its ``progress`` callback.
+
+    Attributes
+    ----------
+    total: :class:`int`
+        Number of assets in the job.
+    completed: :class:`int`
+        Number of assets downloaded so far.
+    skipped: :class:`int`
+        Number of assets skipped because they were already present.
+    failed: :class:`int`
+        Number of assets that could not be downloaded.
+    active: :class:`int`
+        Number of downloads in progress.
+    bytes: :class:`int`
+        Bytes received so far, across all downloads.
+    elapsed: :class:`float`
+        Seconds since the job started.
+    """
+
+    __slots__ = (
+        "total",
+        "completed",
+        "skipped",
+        "failed",
+        "active",
+        "bytes",
+        "elapsed",
+    )
+
+    def __init__(self, total, completed, skipped, failed, active, bytes, elapsed):
+        self.total = total
+        self.completed = completed
+        self.skipped = skipped
+        self.failed = failed
+        self.active = active
+        self.bytes = bytes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} done={self.done}/{self.total} "
+            f"bytes={self.bytes} rate={self.rate:.0f}>"
+        )
+
+    def __str__(self):
+        return (
+            f"{self.done}/{self.total} files ({self.failed} failed, {self.skipped} skipped), "
+            f"{self.bytes / 1e6:.1f} MB at {self.rate / 1e6:.2f} MB/s"
+        )
+
+    @property
+    def done(self):
+        """:class:`int`: Number of assets finished, whatever the outcome."""
+        return self.completed + self.skipped + self.failed
+
+    @property
+    def rate(self):
+        """:class:`float`: Average bytes received per second since the job started."""
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class DownloadManager:
+    """Downloads many assets to a directory with bounded concurrency.
+
+    Assets are downloaded by a fixed pool of workers, with at most ``per_host`` downloads from any one host
+    at a time, so a large batch neither opens a connection per file nor overloads a single server.
+    A failed download doesn't stop the others: each asset gets a :class:`DownloadResult`.
+
+    .. code-block:: python
+
+        manager = aionasa.DownloadManager(concurrency=8, progress=print)
+        pictures = await apod.batch_get(start_date, end_date)
+        results = await manager.download(pictures, "images")
+        failed = [result for result in results if not result.ok]
+
+    Parameters
+    ----------
+    concurrency: :class:`int`
+        Maximum number of downloads in progress at once.
+    per_host: :class:`int`
+        Maximum number of downloads in progress at once from the same host.
+    segments: :class:`int`
+        Passed to :meth:`Asset.save`. Number of byte ranges to download concurrently for each file.
+        These connections are not counted against ``per_host``.
+    progress: :class:`Optional[Callable[[DownloadProgress], None]]`
+        Called every ``progress_interval`` seconds while a job runs, and once when it ends.
+    progress_interval: :class:`float`
+        Seconds between calls to ``progress``.
+    digest: :class:`Optional[str]`
+        Passed to :meth:`Asset.save`. Name of a :mod:`hashlib` algorithm to hash each file with as it is downloaded.
+    """
+
+    def __init__(
+        self,
+        concurrency=8,
+        per_host=4,
+        segments=1,
+        progress=None,
+        progress_interval=1.0,
+        digest=None,
+    ):
+        if concurrency < 1 or per_host < 1:
+            raise ValueError("concurrency and per_host must be at least 1.")
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.segments = segments
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.digest = _digest_algorithm(digest, None)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} concurrency={self.concurrency} per_host={self.per_host}>"
+
+    async def download(self, assets, directory=".", skip_existing=True, **options):
+        """Downloads assets into a directory.
+
+        Each asset is saved under the filename from its URL. Interrupted downloads are resumed
+        (see :meth:`Asset.save`), so running the same job again only fetches what is missing.
+
+        Parameters
+        ----------
+        assets: :class:`Iterable[Asset]`
+            The assets to download, e.g. :class:`AstronomyPicture` or :class:`EarthImage` objects.
+        directory: :class:`str`
+            The directory to save files to. Created if it doesn't exist.
+        skip_existing: :class:`bool`
+            Whether to skip files that are already present with the size the server reports.
+        **options:
+            Passed to each asset's ``save`` method to pick the file to download,
+            e.g. ``hdurl=False`` for APOD or ``filetype='jpg'`` for EPIC.
+
+        Returns
+        -------
+        :class:`List[DownloadResult]`
+            The result of each download, in the same order as ``assets``.
+        """
+        assets = list(assets)
+        os.makedirs(directory, exist_ok=True)
+        job = _Job(self, len(assets))
+        results = [None] * len(assets)
+        queues = collections.OrderedDict()
+
+        for index, asset in enumerate(assets):
+            try:
+                url = asset._download_url(**options)
+            except (NotImplementedError, ArgumentError) as e:
+                # e.g. an APOD entry that links to a video
+                results[index] = job.finish(
+                    DownloadResult(asset, None, "failed", error=e)
+                )
+                continue
+            filename = posixpath.basename(urlsplit(url).path) or asset.filename
+            path = os.path.join(directory, filename)
+            host = urlsplit(url).netloc
+            queues.setdefault(host, collections.deque()).append(
+                (index, asset, url, path)
+            )
+
+        active = collections.Counter()
+        condition = asyncio.Condition()
+
+        async def take():
+            async with condition:
+                while True:
+                    available = [
+                        host
+                        for host, queue in queues.items()
+                        if queue and active[host] < self.per_host
+                    ]
+                    if available:
+                        host = min(available, key=active.__getitem__)
+                        active[host] += 1
+                        return host, queues[host].popleft()
+                    if not any(queues.values()):
+                        return None, None
+                    await condition.wait()
+
+        async def worker():
+            while True:
+                host, item = await take()
+                if item is None:
+                    return
+                index, asset, url, path = item
+                try:
+                    results[index] = await job.run(asset, url, path, skip_existing)
+                finally:
+                    async with condition:
+                        active[host] -= 1
+                        condition.notify_all()
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        reporter = (
+            asyncio.ensure_future(job.report()) if self.progress is not None else None
+        )
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            if reporter is not None:
+                reporter.cancel()
+
+        if self.progress is not None:
+            self.progress(job.snapshot())
+        return results
+
+
+class _Job:
+    """Counters and per-asset logic for a single :meth:`DownloadManager.download` call."""
+
+    def __init__(self, manager, total):
+        self.manager = manager
+        self.total = total
+        self.counts = collections.Counter()
+        self.active = 0
+        self.bytes = 0
+        self.started = time.monotonic()
+
+    def snapshot(self):
+        return DownloadProgress(
+            self.total,
+            self.counts["downloaded"],
+            self.counts["skipped"],
+            self.counts["failed"],
+            self.active,
+            self.bytes,
+            time.monotonic() - self.started,
+        )
+
+    async def report(self):
+        while True:
+            await asyncio.sleep(self.manager.progress_interval)
+            self.manager.progress(self.snapshot())
+
+    def finish(self, result):
+        self.counts[result.status] += 1
+        if result.error is not None:
+            logger.debug(f"Download of {result.asset} failed: {result.error!r}")
+        return result
+
+    def received(self, size):
+        self.bytes += size
+
+    async def run(self, asset, url, path, skip_existing):
+        start = time.monotonic()
+        self.active += 1
+        try:
+            if skip_existing and os.path.exists(path):
+                size = os.path.getsize(path)
+                if await self._remote_size(asset, url) == size:
+                    return self.finish(
+                        DownloadResult(
+                            asset,
+                            path,
+                            "skipped",
+                            size,
+                            elapsed=time.monotonic() - start,
+                        )
+                    )
+            # Asset.save directly: the URL has already been picked from the subclass's options
+            size = await Asset.save(
+                asset,
+                path,
+                url=url,
+                segments=self.manager.segments,
+                progress=self.received,
+                digest=self.manager.digest,
+            )
+            digest = None
+            if self.manager.digest is not None:
+                size, digest = size
+            result = DownloadResult(
+                asset,
+                path,
+                "downloaded",
+                size,
+                elapsed=time.monotonic() - start,
+                digest=digest,
+            )
+        except Exception as e:
+            result = DownloadResult(
+                asset, path, "failed", error=e, elapsed=time.monotonic() - start
+            )
+        finally:
+            self.active -= 1
+        return self.finish(result)
+
+    @staticmethod
+    async def _remote_size(asset, url):
+        """The Content-Length of the file at ``url``, or ``None`` if the server doesn't say."""
+        client = asset.client
+        try:
+            async with client._session.head(
+                client._resolve(url), allow_redirects=True
+            ) as response:
+                if response.status != 200:
+                    return None
+                return response.content_length
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            return None
@@ -1,14 +1,25 @@
+import asyncio
 import datetime
 import logging
+import time
 from typing import List
 
 from ..client import BaseClient
 from ..errors import APIException, ArgumentError
+from ..keys import KeyPool
+from ..planner import plan_requests
 from ..rate_limit import default_rate_limiter, demo_rate_limiter
 from .data import EarthImage
+from .mirrors import GSFC_MIRROR, NASA_MIRROR, Mirror, MirrorSelector
 
 logger = logging.getLogger("aionasa.epic")
 
+# Number of days after which the imagery for a date is considered final.
+ARCHIVE_SETTLE_DAYS = 7
+
+# Number of latency samples needed before hedged requests are sent.
+MIN_HEDGE_SAMPLES = 10
+
 
 # ===============================
 # API MIRRORS:
@@ -24,35 +35,144 @@ class EPIC(BaseClient):
     ----------
     use_nasa_mirror: :class:`bool`
         Whether to use the api.nasa.gov mirror instead of epic.gsfc.nasa.gov
-    api_key: :class:`str`
-        NASA API key to be used by the client.
+    api_key: :class:`Union[str, KeyPool]`
+        NASA API key to be used by the client, or a KeyPool to spread requests across several keys.
     session: :class:`Optional[aiohttp.ClientSession]`
         Optional ClientSession to be used for requests made by this client. Creates a new session by default.
     rate_limiter: :class:`Optional[RateLimiter]`
         Optional RateLimiter class to be used by this client. Uses the library's internal global rate limiting by default.
+    transport: :class:`Optional[Transport]`
+        Optional shared Transport to attach to. Ignored if ``session`` is passed.
+    cache: :class:`Optional[ResponseCache]`
+        Optional cache to serve repeated requests from instead of the network.
+    asset_cache: :class:`Optional[AssetCache]`
+        Optional store to serve repeated image downloads from instead of the network.
+    retry_policy: :class:`Optional[RetryPolicy]`
+        Optional policy for retrying failed requests. Failed requests are not retried by default.
+    tracer: :class:`Optional[Tracer]`
+        Optional tracer that records per-phase timing for each request.
+    redirects: :class:`Optional[dict]`
+        Optional mapping of URL prefixes to replacements, e.g. :attr:`StubServer.redirects`.
+    priority: :class:`Priority`
+        Priority of this client's requests in its rate limiter. Use ``Priority.BACKGROUND`` for bulk jobs
+        that should yield to interactive requests sharing the same limiter. Defaults to ``Priority.NORMAL``.
+    multi_mirror: :class:`bool`
+        Whether to route each request to whichever mirror is currently fastest and healthy,
+        instead of using a single fixed mirror. Overrides ``use_nasa_mirror``.
+    hedge_percentile: :class:`Optional[float]`
+        Only used with ``multi_mirror``. If set (e.g. ``0.95``), a duplicate request is sent to the
+        second-best mirror whenever a request to the preferred mirror takes longer than that
+        percentile of its recent latency. The first response to arrive is used.
 
     ..note::
         The api.nasa.gov mirror is rate limited (like other api.nasa.gov APIs).
         The API at epic.nasa.gov, however, is not, nor does it require an API key to use.
         These features will be ignored when using this API through epic.nasa.gov.
+        In multi-mirror mode, only requests routed to api.nasa.gov are charged to the rate limiter
+        (or, if ``api_key`` is a KeyPool, to the limiter of the key they're sent with).
     """
 
+    _endpoint = "epic"
+
     def __init__(
         self,
         use_nasa_mirror=False,
         api_key="DEMO_KEY",
         session=None,
         rate_limiter=default_rate_limiter,
+        multi_mirror=False,
+        hedge_percentile=None,
+        **kwargs,
     ):
-        if use_nasa_mirror:
+        self.mirrors = None
+        self.hedge_percentile = hedge_percentile
+        self._mirror_api_key = None
+
+        if multi_mirror:
             if api_key == "DEMO_KEY" and rate_limiter:
                 rate_limiter = demo_rate_limiter
-            self.base_url = "https://api.nasa.gov/EPIC"
+            # API requests are built against epic.gsfc.nasa.gov and rewritten for the mirror they're sent to.
+            # asset URLs always point at epic.gsfc.nasa.gov, which needs no key.
+            self._mirror_api_key = api_key
+            api_key = None
+            self.base_url = GSFC_MIRROR
+            self.mirrors = MirrorSelector(
+                [Mirror(GSFC_MIRROR, False), Mirror(NASA_MIRROR, True)]
+            )
+        elif use_nasa_mirror:
+            if api_key == "DEMO_KEY" and rate_limiter:
+                rate_limiter = demo_rate_limiter
+            self.base_url = NASA_MIRROR
         else:
             api_key = None
             rate_limiter = None
-            self.base_url = "https://epic.gsfc.nasa.gov"
-        super().__init__(api_key, session, rate_limiter)
+            self.base_url = GSFC_MIRROR
+        super().__init__(api_key, session, rate_limiter, **kwargs)
+        if isinstance(self._mirror_api_key, KeyPool):
+            # requests routed to api.nasa.gov are spread across the pool's keys
+            self.key_pool = self._mirror_api_key
+            self._mirror_api_key = KeyPool.placeholder
+
+    async def _send(self, url, rate_limited=True):
+        if self.mirrors is None:
+            return await super()._send(url, rate_limited)
+
+        primary, *others = self.mirrors.ranked()
+        secondary = others[0] if others else None
+
+        if (
+            self.hedge_percentile is None
+            or secondary is None
+            or not secondary.healthy(self.mirrors.max_error_rate)
+            or primary.samples < MIN_HEDGE_SAMPLES
+        ):
+            return await self._send_to_mirror(primary, url)
+
+        hedge_after = primary.percentile(self.hedge_percentile)
+        tasks = {asyncio.ensure_future(self._send_to_mirror(primary, url))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                logger.debug(
+                    f"No response from {primary.base_url} after {hedge_after:.3f}s, hedging to {secondary.base_url}."
+                )
+                tasks.add(asyncio.ensure_future(self._send_to_mirror(secondary, url)))
+
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _send_to_mirror(self, mirror, url):
+        url = mirror.base_url + url[len(self.base_url) :]
+        if mirror.requires_key:
+            url += ("&" if "?" in url else "?") + f"api_key={self._mirror_api_key}"
+
+        start = time.monotonic()
+        try:
+            body = await super()._send(url, rate_limited=mirror.requires_key)
+        except APIException as e:
+            # client errors (e.g. a date with no imagery) say nothing about the mirror's health
+            if e.code >= 500 or e.code == 429:
+                mirror.record(error=True)
+            else:
+                mirror.record(time.monotonic() - start)
+            raise
+        except Exception:
+            mirror.record(error=True)
+            raise
+
+        mirror.record(time.monotonic() - start)
+        return body
 
     async def _get_metadata(self, collection, date):
         """Retrieves metadata for imagery for a given collection and date.
@@ -75,25 +195,16 @@ class EPIC(BaseClient):
             )
 
         if date is None:
-            date = ""
+            immutable = False
         else:
-            date = date.strftime("/date/%Y-%m-%d")
-
-        api_key = f"?api_key={self._api_key}" if self._api_key else ""
-        request = f"{self.base_url}/api/{collection}{date}{api_key}"
-
-        if self.rate_limiter:
-            await self.rate_limiter.wait()
-
-        async with self._session.get(request) as response:
-            if response.status != 200:  # not success
-                raise APIException(response.status, response.reason)
+            settled = datetime.date.today() - datetime.timedelta(
+                days=ARCHIVE_SETTLE_DAYS
+            )
+            immutable = date < settled
 
-            json = await response.json()
+        request = self._metadata_url(collection, date)
 
-        if self.rate_limiter:
-            remaining = int(response.headers["X-RateLimit-Remaining"])
-            self.rate_limiter.update(remaining)
+        json = await self._get_json(request, immutable)
 
         images = []
 
@@ -103,6 +214,11 @@ class EPIC(BaseClient):
 
         return images
 
+    def _metadata_url(self, collection, date):
+        date = date.strftime("/date/%Y-%m-%d") if date is not None else ""
+        api_key = f"?api_key={self._api_key}" if self._api_key else ""
+        return f"{self.base_url}/api/{collection}{date}{api_key}"
+
     async def _get_listing(self, collection):
         """Retrieves a listing of dates with available images in the requested collection.
 
@@ -124,18 +240,7 @@ class EPIC(BaseClient):
         api_key = f"?api_key={self._api_key}" if self._api_key else ""
         request = f"{self.base_url}/api/{collection}/available{api_key}"
 
-        if self.rate_limiter:
-            await self.rate_limiter.wait()
-
-        async with self._session.get(request) as response:
-            if response.status != 200:  # not success
-                raise APIException(response.status, response.reason)
-
-            json = await response.json()
-
-        if self.rate_limiter:
-            remaining = int(response.headers["X-RateLimit-Remaining"])
-            self.rate_limiter.update(remaining)
+        json = await self._get_json(request)
 
         dates = []
 
@@ -196,3 +301,39 @@ class EPIC(BaseClient):
             The dates returned by the API.
         """
         return await self._get_listing("enhanced")
+
+    def plan_images(
+        self,
+        dates,
+        collection: str = "natural",
+        request_time: float = None,
+        concurrency: int = 1,
+    ):
+        """Plans retrieving image metadata for many dates, without making any requests.
+
+        Parameters
+        ----------
+        dates: :class:`Iterable[datetime.date]`
+            The dates to retrieve metadata for, e.g. the result of :meth:`natural_listing`.
+        collection: :class:`str`
+            The collection to plan for. Should be 'natural' or 'enhanced'.
+        request_time: :class:`Optional[float]`
+            Seconds each request is expected to take. Estimated from the client's tracer by default.
+        concurrency: :class:`int`
+            Number of requests the job will run at once.
+
+        Returns
+        -------
+        :class:`Plan`
+            The request count and estimated duration of the job. Its ``chunks`` are ``(date,)`` tuples.
+        """
+        if collection not in ("natural", "enhanced"):
+            raise ArgumentError(
+                f"collection expected be 'natural' or 'enhanced' got {collection}"
+            )
+        return plan_requests(
+            self,
+            [((date,), self._metadata_url(collection, date)) for date in dates],
+            request_time,
+            concurrency,
+        )
@@ -65,43 +65,64 @@ class EarthImage(Asset):
 
         super().__init__(client, self.png_url, json["image"] + ".png")
 
-    async def read(self, filetype="png"):
+    def _file_url(self, filetype):
         url = {"png": self.png_url, "jpg": self.jpg_url, "thumb": self.thumb_url}.get(
             filetype
         )
 
         if not url:
             raise ArgumentError("Invalid file type. Expected 'png', 'jpg', or 'thumb'.")
+        return url
 
-        await super().read(url)
+    def _download_url(self, filetype="png"):
+        return self._file_url(filetype)
 
-    async def save(self, path=None, filetype="png"):
-        url = {"png": self.png_url, "jpg": self.jpg_url, "thumb": self.thumb_url}.get(
-            filetype
-        )
+    async def read(self, filetype="png", zero_copy=False):
+        url = self._file_url(filetype)
 
-        if not url:
-            raise ArgumentError("Invalid file type. Expected 'png', 'jpg', or 'thumb'.")
+        return await super().read(url, zero_copy)
+
+    async def save(self, path=None, filetype="png", **kwargs):
+        url = self._file_url(filetype)
+
+        return await super().save(path, url, **kwargs)
+
+    def stream(self, chunk_size=None, filetype="png", **kwargs):
+        """Streams one of this image's files without holding all of it in memory.
+
+        Parameters
+        ----------
+        chunk_size: :class:`Optional[int]`
+            Maximum size of each chunk, in bytes. By default, chunks are whatever has arrived from the network.
+        filetype: :class:`str`
+            The file to stream. Should be 'png', 'jpg', or 'thumb'.
+        **kwargs:
+            Passed to :meth:`Asset.stream`, e.g. ``digest``.
 
-        await super().save(path, url)
+        Returns
+        -------
+        :class:`AssetStream`
+            An async iterator over the chunks of the file.
+        """
+        return super().stream(chunk_size, self._file_url(filetype), **kwargs)
 
     async def read_png(self):
-        await self.read("png")
+        return await self.read("png")
 
     async def save_png(self, path=None):
-        await self.save(path, "png")
+        return await self.save(path, "png")
 
     async def read_jpg(self):
-        await self.read("jpg")
+        return await self.read("jpg")
 
     async def save_jpg(self, path=None):
-        await self.save(path, "jpg")
+        return await self.save(path, "jpg")
 
     async def read_thumb(self):
-        await self.read("thumb")
+        return await self.read("thumb")
 
     async def save_thumb(self, path=None):
-        await self.save(path, "thumb")
+        return await self.save(path, "thumb")
 
 
 J2000Coordinates = namedtuple("J2000Coordinates", ["x", "y", "z"])
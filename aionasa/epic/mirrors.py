@@ -0,0 +1,102 @@
+import time
+from collections import deque
+
+GSFC_MIRROR = "https://epic.gsfc.nasa.gov"
+NASA_MIRROR = "https://api.nasa.gov/EPIC"
+
+
+class Mirror:
+    """Latency and error tracking for a single EPIC API mirror.
+
+    Attributes
+    ----------
+    base_url: :class:`str`
+        The mirror's base URL.
+    requires_key: :class:`bool`
+        Whether requests to this mirror need an api.nasa.gov key and count against the rate limit.
+    """
+
+    def __init__(self, base_url, requires_key, window=100, cooldown=30.0):
+        self.base_url = base_url
+        self.requires_key = requires_key
+        self.cooldown = cooldown
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._last_error = None
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} base_url={self.base_url!r} "
+            f"p50={self.percentile(0.5)} error_rate={self.error_rate:.2f}>"
+        )
+
+    def record(self, latency=None, error=False):
+        """Records the outcome of a request to this mirror."""
+        self._outcomes.append(error)
+        if error:
+            self._last_error = time.monotonic()
+        elif latency is not None:
+            self._latencies.append(latency)
+
+    @property
+    def error_rate(self):
+        """:class:`float`: Fraction of recent requests to this mirror that failed."""
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    @property
+    def samples(self):
+        """:class:`int`: Number of successful requests with recorded latency."""
+        return len(self._latencies)
+
+    def percentile(self, p):
+        """Returns the ``p`` (0-1) latency percentile of recent requests in seconds, or ``None`` if there is no data."""
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(p * len(ordered)))
+        return ordered[index]
+
+    def healthy(self, max_error_rate=0.5):
+        """Whether this mirror should currently receive traffic.
+        Unhealthy mirrors are given another chance once ``cooldown`` seconds have passed since their last error.
+        """
+        if self.error_rate <= max_error_rate:
+            return True
+        return time.monotonic() - self._last_error > self.cooldown
+
+
+class MirrorSelector:
+    """Routes EPIC requests to the fastest healthy mirror.
+
+    Parameters
+    ----------
+    mirrors: :class:`List[Mirror]`
+        The mirrors to choose from.
+    max_error_rate: :class:`float`
+        Error rate above which a mirror is considered unhealthy.
+    """
+
+    def __init__(self, mirrors, max_error_rate=0.5):
+        self.mirrors = list(mirrors)
+        self.max_error_rate = max_error_rate
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} mirrors={self.mirrors}>"
+
+    def ranked(self):
+        """Returns the mirrors ordered from most to least preferred.
+
+        Healthy mirrors come first, ordered by median latency.
+        Mirrors without latency data yet are tried before the others so they get measured.
+        """
+
+        def score(mirror):
+            median = mirror.percentile(0.5)
+            return (
+                not mirror.healthy(self.max_error_rate),
+                median if median is not None else 0.0,
+            )
+
+        return sorted(self.mirrors, key=score)
@@ -8,9 +8,10 @@ class NASAException(Exception):
 
 
 class APIException(NASAException):
-    def __init__(self, code, reason):
+    def __init__(self, code, reason, headers=None):
         self.code = code
         self.reason = reason
+        self.headers = headers or {}
         super().__init__(f"{code} - {reason}")
 
 
@@ -22,6 +23,23 @@ class PandasNotFound(NASAException):
     pass
 
 
+class DigestMismatch(NASAException):
+    """Raised when a downloaded file doesn't have the expected digest.
+
+    Unlike a truncated or corrupted transfer, this won't be fixed by downloading the file again,
+    so it is not retried by :class:`RetryPolicy`.
+    """
+
+    def __init__(self, name, algorithm, expected, actual):
+        self.name = name
+        self.algorithm = algorithm
+        self.expected = expected
+        self.actual = actual
+        super().__init__(
+            f"{algorithm} mismatch for {name}: expected {expected}, got {actual}."
+        )
+
+
 # class NotFound(APIException):
 #     pass
 #
@@ -1,13 +1,8 @@
 import io
 import json
 
-try:
-    import pandas
-except ImportError:
-    pandas = None
-
 from ..client import BaseClient
-from ..errors import APIException, PandasNotFound
+from ..errors import PandasNotFound
 from ..rate_limit import default_rate_limiter, demo_rate_limiter
 
 ####################################################################################################################################
@@ -18,6 +13,15 @@ from ..rate_limit import default_rate_limiter, demo_rate_limiter
 BASE_URL = "https://exoplanetarchive.ipac.caltech.edu/cgi-bin/nstedAPI/nph-nstedAPI"
 
 
+def _import_pandas():
+    # pandas is optional and slow to import, so it is only loaded when a DataFrame is requested.
+    try:
+        import pandas
+    except ImportError:
+        raise PandasNotFound from None
+    return pandas
+
+
 class Exoplanet(BaseClient):
     """Client for NASA Exoplanet Archive API.
 
@@ -25,18 +29,16 @@ class Exoplanet(BaseClient):
         Requests to this API do not seem to be subject to api.nasa.gov rate limits.
     """
 
-    def __init__(self, api_key="DEMO_KEY", session=None):
-        super().__init__(api_key, session, None)
+    _endpoint = "exoplanet"
+
+    def __init__(self, api_key="DEMO_KEY", session=None, **kwargs):
+        super().__init__(api_key, session, None, **kwargs)
 
     async def _get_raw(self, querystring):
         url = f"{BASE_URL}?{querystring}"
 
-        async with self._session.get(url) as resp:
-            if resp.status != 200:
-                raise APIException(resp.status, resp.reason)
-            data = await resp.text()
-
-        return data
+        data = await self._request(url)
+        return data.decode()
 
     # Seems to not be supported. Throws a Mimetype error
     # async def _get_json(self, querystring):
@@ -104,8 +106,7 @@ class Exoplanet(BaseClient):
         queries = [f"{param}={value}" for param, value in query.items() if value]
         querystring += "&" + "&".join(queries) if query else ""
 
-        if not pandas:
-            raise PandasNotFound
+        pandas = _import_pandas()
 
         text = await self._get_raw(querystring)
         file = io.StringIO(text)
@@ -168,8 +169,7 @@ class Exoplanet(BaseClient):
         queries = [f"{param}={value}" for param, value in query.items() if value]
         querystring += "&" + "&".join(queries) if query else ""
 
-        if not pandas:
-            raise PandasNotFound
+        pandas = _import_pandas()
 
         text = await self._get_raw(querystring)
         file = io.StringIO(text)
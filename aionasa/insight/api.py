@@ -1,7 +1,6 @@
 import logging
 
 from ..client import BaseClient
-from ..errors import APIException
 from ..rate_limit import demo_rate_limiter, insight_rate_limiter
 
 logger = logging.getLogger("aionasa.insight")
@@ -12,14 +11,29 @@ class InSight(BaseClient):
 
     Parameters
     ----------
-    api_key: :class:`str`
-        NASA API key to be used by the client.
+    api_key: :class:`Union[str, KeyPool]`
+        NASA API key to be used by the client, or a KeyPool to spread requests across several keys.
     session: :class:`Optional[aiohttp.ClientSession]`
         Optional ClientSession to be used for requests made by this client. Creates a new session by default.
     rate_limiter: :class:`Optional[RateLimiter]`
         Optional RateLimiter class to be used by this client. Uses the library's internal global rate limiting by default.
+    transport: :class:`Optional[Transport]`
+        Optional shared Transport to attach to. Ignored if ``session`` is passed.
+    cache: :class:`Optional[ResponseCache]`
+        Optional cache to serve repeated requests from instead of the network.
+    retry_policy: :class:`Optional[RetryPolicy]`
+        Optional policy for retrying failed requests. Failed requests are not retried by default.
+    tracer: :class:`Optional[Tracer]`
+        Optional tracer that records per-phase timing for each request.
+    redirects: :class:`Optional[dict]`
+        Optional mapping of URL prefixes to replacements, e.g. :attr:`StubServer.redirects`.
+    priority: :class:`Priority`
+        Priority of this client's requests in its rate limiter. Use ``Priority.BACKGROUND`` for bulk jobs
+        that should yield to interactive requests sharing the same limiter. Defaults to ``Priority.NORMAL``.
     """
 
+    _endpoint = "insight"
+
     def __init__(
         self,
         api_key="DEMO_KEY",
@@ -47,17 +61,6 @@ class InSight(BaseClient):
 
         request = f"https://api.nasa.gov/insight_weather/?ver=1.0&feedtype={feedtype}&api_key={self._api_key}"
 
-        if self.rate_limiter:
-            await self.rate_limiter.wait()
-
-        async with self._session.get(request) as response:
-            if response.status != 200:  # not a success
-                raise APIException(response.status, response.reason)
-
-            json = await response.json()
-
-        if self.rate_limiter:
-            remaining = int(response.headers["X-RateLimit-Remaining"])
-            self.rate_limiter.update(remaining)
+        json = await self._get_json(request)
 
         return json
@@ -0,0 +1,81 @@
+import itertools
+import logging
+import re
+
+from .rate_limit import RateLimiter
+
+logger = logging.getLogger("aionasa.keys")
+
+_API_KEY_PARAM = re.compile(r"([?&]api_key=)[^&#]*")
+
+
+class KeyPool:
+    """A set of api.nasa.gov keys, each with its own :class:`RateLimiter`.
+
+    Pass a KeyPool as the ``api_key`` argument of any client. Each request is sent with the key
+    that has the most requests remaining (as reported by the ``X-RateLimit-Remaining`` header),
+    and waits only on that key's rate limiter. Keys with equal budgets are used in turn.
+
+    Parameters
+    ----------
+    keys: :class:`Iterable[str]`
+        The API keys to use.
+    limit: :class:`int`
+        Hourly request limit of each key.
+    rate_limiters: :class:`Optional[dict]`
+        Optional mapping of key to RateLimiter, for keys that should use a specific limiter.
+    """
+
+    #: Stands in for the key in URLs built by a client using the pool, until a key is picked for the request.
+    placeholder = "KEYPOOL"
+
+    def __init__(self, keys, limit=1000, rate_limiters=None):
+        self.keys = list(keys)
+        if not self.keys:
+            raise ValueError("KeyPool requires at least one key.")
+        rate_limiters = rate_limiters or {}
+        self.rate_limiters = {
+            key: rate_limiters.get(key)
+            or RateLimiter(limit, f"<RateLimiter key={self._mask(key)}>")
+            for key in self.keys
+        }
+        self._counter = itertools.count()
+        self._last_used = {key: -1 for key in self.keys}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} keys={len(self.keys)} remaining={self.remaining}>"
+
+    def __str__(self):
+        return f"{self.__class__.__name__}({len(self.keys)} keys)"
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def _mask(key):
+        return f"{key[:4]}..." if len(key) > 4 else key
+
+    @property
+    def remaining(self):
+        """:class:`int`: Combined number of requests remaining across all keys."""
+        return sum(limiter.remaining for limiter in self.rate_limiters.values())
+
+    def select(self):
+        """Picks the key to use for the next request.
+
+        Returns
+        -------
+        :class:`Tuple[str, RateLimiter]`
+            The key with the most remaining budget, and its rate limiter.
+        """
+        key = max(
+            self.keys,
+            key=lambda k: (self.rate_limiters[k].remaining, -self._last_used[k]),
+        )
+        self._last_used[key] = next(self._counter)
+        return key, self.rate_limiters[key]
+
+    @staticmethod
+    def apply(url, key):
+        """Returns ``url`` with the value of its ``api_key`` query parameter replaced by ``key``."""
+        return _API_KEY_PARAM.sub(lambda m: m.group(1) + key, url)
@@ -3,37 +3,37 @@ import logging
 
 from ..client import BaseClient
 from ..errors import *
+from ..planner import aligned_ranges, plan_requests
 from ..rate_limit import default_rate_limiter, demo_rate_limiter
 from .paginators import NeoWsFeedPage
 
 logger = logging.getLogger("aionasa.neows")
 
+# The feed endpoint returns at most 7 days per request.
+FEED_MAX_DAYS = 7
+
+# Feed chunks are aligned to weeks starting on this (arbitrary) Monday.
+FEED_EPOCH = datetime.date(2000, 1, 3)
+
 
 class NeoWs(BaseClient):
     """Client for NASA Near Earth Object Weather Service."""
 
+    _endpoint = "neows"
+
     def __init__(
-        self, api_key="DEMO_KEY", session=None, rate_limiter=default_rate_limiter
+        self,
+        api_key="DEMO_KEY",
+        session=None,
+        rate_limiter=default_rate_limiter,
+        **kwargs,
     ):
         if api_key == "DEMO_KEY" and rate_limiter:
             rate_limiter = demo_rate_limiter
-        super().__init__(api_key, session, rate_limiter)
+        super().__init__(api_key, session, rate_limiter, **kwargs)
 
     async def _get(self, url):
-        if self.rate_limiter:
-            await self.rate_limiter.wait()
-
-        async with self._session.get(url) as response:
-            if response.status != 200:
-                raise APIException(response.status, response.reason)
-
-            json = await response.json()
-
-        if self.rate_limiter:
-            remaining = int(response.headers["X-RateLimit-Remaining"])
-            self.rate_limiter.update(remaining)
-
-        return json
+        return await self._get_json(url)
 
     async def feed(self, start_date: datetime.date, end_date: datetime.date = None):
         """Retrieve a list of Asteroids based on their closest approach date to Earth.
@@ -50,14 +50,7 @@ class NeoWs(BaseClient):
         :class:`List[Asteroid]`
             A list of Asteroids returned by the API.
         """
-        start_date = "start_date=" + start_date.strftime("%Y-%m-%d") + "&"
-
-        if end_date is None:  # parameter will be left out of the query.
-            end_date = ""
-        else:
-            end_date = "end_date=" + end_date.strftime("%Y-%m-%d") + "&"
-
-        request = f"https://api.nasa.gov/neo/rest/v1/feed?{start_date}{end_date}api_key={self._api_key}"
+        request = self._feed_url(start_date, end_date)
         json = await self._get(request)
         return NeoWsFeedPage(self, json)
 
@@ -74,10 +67,88 @@ class NeoWs(BaseClient):
         :class:`Asteroid`
             Data for the requested NEO.
         """
-        request = f"https://api.nasa.gov/neo/rest/v1/neo/{asteroid_id}?api_key={self._api_key}"
+        request = self._lookup_url(asteroid_id)
         json = await self._get(request)
         return json
 
+    def _feed_url(self, start_date, end_date):
+        start_date = "start_date=" + start_date.strftime("%Y-%m-%d") + "&"
+
+        if end_date is None:  # parameter will be left out of the query.
+            end_date = ""
+        else:
+            end_date = "end_date=" + end_date.strftime("%Y-%m-%d") + "&"
+
+        return f"https://api.nasa.gov/neo/rest/v1/feed?{start_date}{end_date}api_key={self._api_key}"
+
+    def _lookup_url(self, asteroid_id):
+        return f"https://api.nasa.gov/neo/rest/v1/neo/{asteroid_id}?api_key={self._api_key}"
+
+    def plan_feed(
+        self,
+        start_date: datetime.date,
+        end_date: datetime.date,
+        request_time: float = None,
+        concurrency: int = 1,
+    ):
+        """Plans retrieving the feed for a date range of any length, without making any requests.
+
+        The range is split into week-aligned :meth:`feed` calls, the longest range the API accepts.
+
+        Parameters
+        ----------
+        start_date: :class:`datetime.date`
+            The first date to retrieve.
+        end_date: :class:`datetime.date`
+            The last date to retrieve. Range is inclusive.
+        request_time: :class:`Optional[float]`
+            Seconds each request is expected to take. Estimated from the client's tracer by default.
+        concurrency: :class:`int`
+            Number of requests the job will run at once.
+
+        Returns
+        -------
+        :class:`Plan`
+            The request count and estimated duration of the job.
+            Its ``chunks`` are ``(start_date, end_date)`` arguments for :meth:`feed`.
+        """
+        chunks = aligned_ranges(start_date, end_date, FEED_MAX_DAYS, FEED_EPOCH)
+        return plan_requests(
+            self,
+            [(chunk, self._feed_url(*chunk)) for chunk in chunks],
+            request_time,
+            concurrency,
+        )
+
+    def plan_lookup(
+        self, asteroid_ids, request_time: float = None, concurrency: int = 1
+    ):
+        """Plans looking up many asteroids, without making any requests.
+
+        Parameters
+        ----------
+        asteroid_ids: :class:`Iterable[int]`
+            The asteroids to look up.
+        request_time: :class:`Optional[float]`
+            Seconds each request is expected to take. Estimated from the client's tracer by default.
+        concurrency: :class:`int`
+            Number of requests the job will run at once.
+
+        Returns
+        -------
+        :class:`Plan`
+            The request count and estimated duration of the job. Its ``chunks`` are ``(asteroid_id,)`` tuples.
+        """
+        return plan_requests(
+            self,
+            [
+                ((asteroid_id,), self._lookup_url(asteroid_id))
+                for asteroid_id in asteroid_ids
+            ],
+            request_time,
+            concurrency,
+        )
+
     async def browse(self, page: int = 0):
         """Browse the overall asteroid dataset.
 
@@ -16,7 +16,7 @@ class NeoWsFeedPage:
     def __init__(self, client, json):
         self.json = json
         self._client = client
-        self._session = client.session
+        self._session = client._session
         self._url_self = json["links"]["self"]
         self._url_prev = json["links"]["prev"]
         self._url_next = json["links"]["next"]
@@ -70,7 +70,7 @@ class NeoWsBrowsePage:
     def __init__(self, client, json):
         self.json = json
         self._client = client
-        self._session = client.session
+        self._session = client._session
         self._url_self = json["links"]["self"]
 
         # one of these might be None (if it's the first or last page)
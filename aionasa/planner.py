@@ -0,0 +1,224 @@
+import datetime
+import heapq
+import logging
+import statistics
+import time
+
+from .utils import normalize_url
+
+logger = logging.getLogger("aionasa.planner")
+
+#: Seconds assumed per request when the client has no tracer history to estimate from.
+DEFAULT_REQUEST_TIME = 0.5
+
+
+class PlannedRequest:
+    """A single request in a :class:`Plan`.
+
+    Attributes
+    ----------
+    args: :class:`tuple`
+        The arguments to pass to the client method that makes this request, e.g. ``(start_date, end_date)``.
+    url: :class:`str`
+        The URL that will be requested.
+    cached: :class:`bool`
+        Whether the response is already in the client's cache, so no HTTP request is needed.
+    start: :class:`Optional[float]`
+        Estimated number of seconds from now until the rate limiter admits this request.
+        ``None`` for cached requests.
+    """
+
+    __slots__ = ("args", "url", "cached", "start")
+
+    def __init__(self, args, url, cached=False, start=None):
+        self.args = args
+        self.url = url
+        self.cached = cached
+        self.start = start
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} args={self.args} cached={self.cached} start={self.start}>"
+
+
+class Plan:
+    """The estimated cost of a batch of requests, as returned by the clients' ``plan_*`` methods.
+
+    Attributes
+    ----------
+    requests: :class:`List[PlannedRequest]`
+        Every request of the job, in the order they should be made.
+    duration: :class:`float`
+        Estimated number of seconds the job will take under the current rate limit budget.
+    """
+
+    def __init__(self, requests, duration):
+        self.requests = requests
+        self.duration = duration
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} total={self.total} cached={self.cached} "
+            f"request_count={self.request_count} duration={self.duration:.1f}>"
+        )
+
+    def __iter__(self):
+        return iter(self.requests)
+
+    def __len__(self):
+        return len(self.requests)
+
+    @property
+    def total(self):
+        """:class:`int`: Number of requests in the job, including cached ones."""
+        return len(self.requests)
+
+    @property
+    def cached(self):
+        """:class:`int`: Number of requests that will be served from the cache."""
+        return sum(request.cached for request in self.requests)
+
+    @property
+    def request_count(self):
+        """:class:`int`: Number of HTTP requests the job will make, counting against the rate limit."""
+        return self.total - self.cached
+
+    @property
+    def chunks(self):
+        """:class:`List[tuple]`: The arguments of each request, in order."""
+        return [request.args for request in self.requests]
+
+    def to_dict(self):
+        """Returns a JSON-serializable summary of the plan."""
+        return {
+            "total": self.total,
+            "cached": self.cached,
+            "request_count": self.request_count,
+            "duration": self.duration,
+            "requests": [
+                {
+                    "args": [str(arg) for arg in request.args],
+                    "url": request.url,
+                    "cached": request.cached,
+                    "start": request.start,
+                }
+                for request in self.requests
+            ],
+        }
+
+
+def _request_time(client):
+    tracer = getattr(client, "tracer", None)
+    if tracer is not None:
+        totals = [
+            record.total
+            for record in tracer.records
+            if record.total is not None and record.error is None
+        ]
+        if totals:
+            return statistics.median(totals)
+    return DEFAULT_REQUEST_TIME
+
+
+def _rate_limiters(client):
+    if client.key_pool is not None:
+        return list(client.key_pool.rate_limiters.values())
+    if client.rate_limiter is not None:
+        return [client.rate_limiter]
+    return []
+
+
+def plan_requests(client, requests, request_time=None, concurrency=1):
+    """Estimates the cost of making a list of requests with a client.
+
+    Requests already in the client's cache are free. The rest are admitted through a simulation of the
+    client's rate limiter (or every limiter of its :class:`KeyPool`), starting from its current state,
+    with at most ``concurrency`` requests in flight at once.
+
+    Parameters
+    ----------
+    client: :class:`BaseClient`
+        The client that will run the job.
+    requests: :class:`Iterable[Tuple[tuple, str]]`
+        ``(args, url)`` pairs for each request of the job.
+    request_time: :class:`Optional[float]`
+        Seconds each request is expected to take. Defaults to the median of the client's tracer history,
+        or :data:`DEFAULT_REQUEST_TIME`.
+    concurrency: :class:`int`
+        Number of requests the job will run at once.
+
+    Returns
+    -------
+    :class:`Plan`
+        The estimated cost of the job.
+    """
+    if request_time is None:
+        request_time = _request_time(client)
+    cache = client.cache
+    planned = [
+        PlannedRequest(
+            args, url, cached=cache is not None and normalize_url(url) in cache
+        )
+        for args, url in requests
+    ]
+
+    now = time.monotonic()
+    simulations = [
+        (limiter._snapshot(), limiter.reserve.get(client.priority, 0))
+        for limiter in _rate_limiters(client)
+    ]
+    # times at which each of the job's connections is next free
+    free_at = [now] * max(1, concurrency)
+    clock = now
+    for request in planned:
+        if request.cached:
+            continue
+        clock = max(clock, heapq.heappop(free_at))
+        start = clock
+        if simulations:
+            # with several keys, the request goes to whichever limiter admits it first
+            start, windows = min(
+                (
+                    (
+                        clock + max(window.delay(clock, reserve) for window in windows),
+                        windows,
+                    )
+                    for windows, reserve in simulations
+                ),
+                key=lambda option: option[0],
+            )
+            start = max(start, clock)
+            for window in windows:
+                window.admit(start)
+        clock = start
+        request.start = start - now
+        heapq.heappush(free_at, start + request_time)
+
+    duration = max(free_at) - now if any(not r.cached for r in planned) else 0.0
+    logger.debug(
+        f"Planned {len(planned)} requests: {duration:.1f}s at {request_time:.3f}s per request."
+    )
+    return Plan(planned, duration)
+
+
+def aligned_ranges(start_date, end_date, days, epoch):
+    """Splits an inclusive date range into spans of at most ``days`` days.
+
+    Spans are aligned to multiples of ``days`` counted from ``epoch`` rather than to ``start_date``,
+    so overlapping jobs produce the same spans and can share cached responses.
+
+    Returns
+    -------
+    :class:`List[Tuple[datetime.date, datetime.date]]`
+        The ``(start, end)`` dates of each span, in order.
+    """
+    if end_date < start_date:
+        raise ValueError("end_date must not be before start_date.")
+    step = datetime.timedelta(days=days)
+    offset = (start_date - epoch).days % days
+    block_start = start_date - datetime.timedelta(days=offset)
+    ranges = []
+    while block_start <= end_date:
+        block_end = block_start + step - datetime.timedelta(days=1)
+        ranges.append((max(block_start, start_date), min(block_end, end_date)))
+        block_start += step
+    return ranges
@@ -1,54 +1,553 @@
 import asyncio
+import atexit
+import enum
+import heapq
+import itertools
+import json
 import logging
+import os
+import random
+import sqlite3
+import threading
 import time
 from collections import deque
 
 logger = logging.getLogger("aionasa.rate_limit")
 
+# seconds a SharedRateLimiter waits (on average) before retrying while another process holds the database
+LOCK_RETRY_DELAY = 0.005
+
+
+class Priority(enum.IntEnum):
+    """Admission priority of a request. Lower values are admitted first."""
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+class RateWindow:
+    """A rolling window allowing at most ``limit`` requests in any ``period`` seconds.
+
+    Attributes
+    ----------
+    limit: :class:`int`
+        Maximum number of requests per period.
+    period: :class:`float`
+        Length of the window, in seconds.
+    """
+
+    def __init__(self, limit, period):
+        self.limit = limit
+        self.period = period
+        self._requests = deque()  # monotonic admission times, oldest first
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} limit={self.limit} period={self.period} remaining={self.remaining}>"
+
+    def _expire(self, now):
+        cutoff = now - self.period
+        while self._requests and self._requests[0] <= cutoff:
+            self._requests.popleft()
+
+    @property
+    def remaining(self):
+        """:class:`int`: Number of requests that can be made right now."""
+        self._expire(time.monotonic())
+        return max(0, self.limit - len(self._requests))
+
+    def delay(self, now, reserve=0):
+        """Returns the number of seconds until a request can be admitted (0 if one can be admitted now),
+        leaving at least ``reserve`` requests of the window unused.
+        """
+        self._expire(now)
+        # a window always admits at least one request per period, however much is reserved
+        excess = len(self._requests) - max(1, self.limit - reserve)
+        if excess < 0:
+            return 0.0
+        # the request that has to expire before there is room again
+        return self._requests[excess] + self.period - now
+
+    def admit(self, now):
+        self._requests.append(now)
+
+    def copy(self):
+        """Returns an independent copy of the window, e.g. to simulate future admissions."""
+        window = self.__class__(self.limit, self.period)
+        window._requests = deque(self._requests)
+        return window
+
+    def sync(self, remaining, now):
+        """Accounts for requests the server has seen that this window hasn't (e.g. from other processes)."""
+        self._expire(now)
+        unseen = (self.limit - remaining) - len(self._requests)
+        if unseen > 0:
+            logger.debug(f"Server reports {unseen} more requests than tracked locally.")
+            # their real timestamps are unknown, so assume they were just made
+            self._requests.extend([now] * unseen)
+
 
 class RateLimiter:
     """Class that handles rate limit across the whole library.
     This is necessary to ensure observation of rate limits even if multiple API endpoints are being used.
+
+    Requests are admitted by :class:`Priority`, and in the order :meth:`wait` was called within a priority.
+    A limiter can be shared by event loops running in different threads; the ordering holds across all of them.
+    A lower-priority request is never admitted while a higher-priority one is waiting, so background
+    work such as prefetching or archive crawls yields to interactive requests.
+    Every request must fit in all of the limiter's windows: an hourly window of ``limit`` requests,
+    plus any additional ``windows`` (e.g. a daily limit).
+    The hourly window is kept in sync with the ``X-RateLimit-Limit`` and ``X-RateLimit-Remaining``
+    headers reported through :meth:`update`.
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        Number of requests allowed per hour.
+    windows: :class:`Optional[List[Tuple[int, float]]]`
+        Additional ``(limit, period in seconds)`` windows to enforce, e.g. ``[(50, 86400)]`` for 50 requests per day.
+    reserve: :class:`Optional[dict]`
+        Mapping of :class:`Priority` to a number of requests that callers of that priority must leave unused
+        in every window, keeping that budget for higher priorities. For example,
+        ``{Priority.NORMAL: 50, Priority.BACKGROUND: 200}`` holds the last 50 requests for interactive callers,
+        and stops background callers once fewer than 200 remain.
+    state_file: :class:`Optional[str]`
+        Optional path of a file to keep the limiter's state in. The windows and the last rate limit reported
+        by the server are restored from it on initialization and written back (at most every ``save_interval``
+        seconds) as requests are made, so a restarted process resumes at the right pace.
+    save_interval: :class:`float`
+        Minimum number of seconds between writes to ``state_file``.
     """
 
-    def __init__(self, limit, _repr=None):
+    def __init__(
+        self,
+        limit,
+        _repr=None,
+        windows=None,
+        reserve=None,
+        state_file=None,
+        save_interval=1.0,
+    ):
         logger.debug("Initializing `RateLimiter`")
-        self._requests = deque(iterable=[time.monotonic()] * limit, maxlen=limit)
-        self._limit = limit
-        self._remaining = limit
-        self._repr = _repr or f"<{self.__class__}>"
+        self._hourly = RateWindow(limit, 3600)
+        self.windows = [self._hourly] + [
+            RateWindow(window_limit, period) for window_limit, period in windows or []
+        ]
+        self.reserve = {Priority(key): value for key, value in (reserve or {}).items()}
+        # heap of (priority, sequence number, wakeup event, event loop of the waiter)
+        self._waiters = []
+        self._counter = itertools.count()
+        # guards the windows and waiters, which may be used from several threads and event loops at once
+        self._mutex = threading.RLock()
+        self._repr = _repr or f"<{self.__class__.__name__} limit={limit}>"
+        # (remaining, wall-clock time) from the most recent update()
+        self.last_reported = None
+        self.state_file = state_file
+        self.save_interval = save_interval
+        self._save_handle = None
+        self._save_loop = None
+        if state_file:
+            self.load(state_file)
+            atexit.register(self.save)
+
+    @property
+    def limit(self):
+        """:class:`int`: The number of requests allowed per hour."""
+        return self._hourly.limit
 
     @property
     def remaining(self):
         """:class:`int`: The number of requests remaining.
         Starts at the total request count specified on initialization and updates on each API request.
         """
-        return self._remaining
+        with self._mutex:
+            return min(window.remaining for window in self.windows)
+
+    @property
+    def waiting(self):
+        """:class:`int`: Number of callers currently waiting in :meth:`wait`."""
+        return len(self._waiters)
+
+    def waiting_above(self, priority):
+        """Returns whether any caller with a higher priority than ``priority`` is waiting.
+        Long-running background jobs can check this to pause between batches.
+        """
+        with self._mutex:
+            return any(entry[0] < priority for entry in self._waiters)
+
+    def _try_admit(self, reserve):
+        """Admits a request if every window has room. Returns 0 if admitted, otherwise the number of seconds to wait."""
+        now = time.monotonic()
+        time_to_wait = max(window.delay(now, reserve) for window in self.windows)
+        if time_to_wait <= 0:
+            for window in self.windows:
+                window.admit(now)
+            self._schedule_save()
+        return time_to_wait
+
+    def _snapshot(self):
+        """Returns copies of the limiter's windows, for simulating admissions without affecting it."""
+        with self._mutex:
+            return [window.copy() for window in self.windows]
+
+    def _wake_head(self):
+        if not self._waiters:
+            return
+        _, _, wakeup, loop = self._waiters[0]
+        try:
+            if loop is asyncio.get_running_loop():
+                wakeup.set()
+                return
+        except RuntimeError:
+            pass
+        # the head is waiting on another thread's event loop
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            logger.debug("Could not wake a waiter: its event loop is closed.")
+
+    async def wait(self, priority=Priority.NORMAL):
+        """Waits until a request can be made without exceeding the rate limit, then counts that request.
+        Concurrent callers are admitted one at a time, highest priority first.
 
-    async def wait(self):
+        Parameters
+        ----------
+        priority: :class:`Priority`
+            Priority of the request. Defaults to ``Priority.NORMAL``.
+        """
         logger.debug("`RateLimiter.wait()` was called.")
-        if self._remaining < 1:
-            timestamp = self._requests.popleft()
-            time_to_wait = 3600 - (time.monotonic() - timestamp)
-            if time_to_wait > 0:
-                logger.debug(f"Sleeping for {time_to_wait} seconds.")
-                await asyncio.sleep(time_to_wait)
-            else:
-                logger.debug(
-                    f"Skipping sleep due to invalid sleep duration: {time_to_wait}"
-                )
-        else:
-            logger.debug(">0 requests remaining, sleep is not necessary.")
-
-    def update(self, remaining):
+        priority = Priority(priority)
+        reserve = self.reserve.get(priority, 0)
+        wakeup = asyncio.Event()
+        with self._mutex:
+            entry = (priority, next(self._counter), wakeup, asyncio.get_running_loop())
+            heapq.heappush(self._waiters, entry)
+
+        try:
+            # only the caller at the head of the queue sleeps on the windows; the rest wait to be woken
+            while True:
+                wakeup.clear()
+                time_to_wait = None
+                with self._mutex:
+                    if self._waiters[0] is entry:
+                        time_to_wait = self._try_admit(reserve)
+                        if time_to_wait <= 0:
+                            return
+                if time_to_wait is not None:
+                    logger.debug(f"Sleeping for {time_to_wait} seconds.")
+                try:
+                    await asyncio.wait_for(wakeup.wait(), time_to_wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            with self._mutex:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._wake_head()
+
+    def update(self, remaining, limit=None):
+        """Updates the limiter with the rate limit state reported by the server.
+
+        Parameters
+        ----------
+        remaining: :class:`int`
+            The value of the ``X-RateLimit-Remaining`` header.
+        limit: :class:`Optional[int]`
+            The value of the ``X-RateLimit-Limit`` header, if present.
+        """
         logger.debug(f"Updating rate limit: {remaining} requests remaining.")
-        self._remaining = remaining
-        self._requests.append(time.monotonic())
+        with self._mutex:
+            if limit is not None and limit != self._hourly.limit:
+                logger.debug(f"Server reports an hourly limit of {limit}.")
+                self._hourly.limit = limit
+            self._hourly.sync(remaining, time.monotonic())
+            self.last_reported = (remaining, time.time())
+            self._schedule_save()
+            self._wake_head()
+
+    def _schedule_save(self):
+        if not self.state_file:
+            return
+        # a save scheduled on a loop that has since closed (e.g. an earlier asyncio.run()) will never run
+        if self._save_handle is not None and not self._save_loop.is_closed():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        self._save_loop = loop
+        self._save_handle = loop.call_later(self.save_interval, self.save)
+
+    def save(self, path=None):
+        """Writes the limiter's state to a file.
+
+        Parameters
+        ----------
+        path: :class:`Optional[str]`
+            The file to write to. Defaults to ``state_file``.
+        """
+        path = path or self.state_file
+        # a pending scheduled save may belong to another thread's loop, so it is left to run (harmlessly) instead
+        # of being cancelled
+        self._save_handle = None
+        if not path:
+            return
+
+        with self._mutex:
+            # monotonic time doesn't survive a restart, so admission times are stored as wall-clock time
+            offset = time.time() - time.monotonic()
+            state = {
+                "limit": self._hourly.limit,
+                "last_reported": self.last_reported,
+                "windows": [
+                    {
+                        "period": window.period,
+                        "requests": [ts + offset for ts in window._requests],
+                    }
+                    for window in self.windows
+                ],
+            }
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """Restores the limiter's state from a file written by :meth:`save`.
+        Missing or unreadable files are ignored.
+
+        Only the recorded requests are restored. The limiter keeps its configured limits, e.g. after
+        switching from ``DEMO_KEY`` to a real key, until the server reports a different one.
+
+        Parameters
+        ----------
+        path: :class:`Optional[str]`
+            The file to read from. Defaults to ``state_file``.
+
+        Returns
+        -------
+        :class:`bool`
+            Whether any state was restored.
+        """
+        path = path or self.state_file
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            saved = {
+                window["period"]: [float(ts) for ts in window["requests"]]
+                for window in state["windows"]
+            }
+            last_reported = state.get("last_reported")
+            last_reported = tuple(last_reported) if last_reported else None
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # unreadable, or written by an incompatible version
+            logger.warning(f"Could not read rate limiter state from {path!r}: {e!r}")
+            return False
+
+        offset = time.time() - time.monotonic()
+        now = time.monotonic()
+        for window in self.windows:
+            # windows are matched by period, in case the configuration changed between runs
+            requests = sorted(ts - offset for ts in saved.get(window.period, ()))
+            # if the wall clock went backwards, treat requests from the "future" as just made
+            window._requests = deque(min(ts, now) for ts in requests)
+            window._expire(now)
+        if last_reported:
+            self.last_reported = last_reported
+        logger.debug(
+            f"Restored rate limiter state from {path!r}: {self.remaining} requests remaining."
+        )
+        return True
 
     def __repr__(self):
         return self._repr
 
 
+class SharedRateLimiter(RateLimiter):
+    """A RateLimiter whose state is shared by every process on the machine using the same file.
+
+    Use this instead of :class:`RateLimiter` when several worker processes make requests with the same
+    API key, so that together they stay within the key's limit. Request timestamps are stored in a
+    small SQLite database, and every admission happens inside a write transaction, so processes can't
+    both take the last remaining request. Within a process, waiters are admitted by priority as with
+    :class:`RateLimiter`; across processes, whichever process checks first after a slot frees up gets it.
+    Since the state lives in the database file, it also survives restarts. The database is never waited on
+    while it is locked by another process: the request retries shortly after instead, without blocking the event loop.
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        Number of requests allowed per hour.
+    path: :class:`str`
+        Location of the shared database file. Every process sharing the budget must use the same path.
+    windows: :class:`Optional[List[Tuple[int, float]]]`
+        Additional ``(limit, period in seconds)`` windows to enforce.
+    reserve: :class:`Optional[dict]`
+        Budget held back from lower priorities, as for :class:`RateLimiter`.
+    """
+
+    def __init__(
+        self,
+        limit,
+        path="aionasa_rate_limit.sqlite3",
+        windows=None,
+        reserve=None,
+        _repr=None,
+    ):
+        super().__init__(limit, _repr, windows, reserve)
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # timestamps are compared across processes, so wall-clock time is used instead of time.monotonic()
+        self._db = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS requests (ts REAL NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS requests_ts ON requests (ts)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value REAL NOT NULL)"
+        )
+        self._db.execute(
+            "INSERT OR IGNORE INTO settings (name, value) VALUES ('hourly_limit', ?)",
+            (limit,),
+        )
+        # from now on, fail at once instead of blocking the event loop while another process holds the lock
+        self._db.execute("PRAGMA busy_timeout = 0")
+        self._repr = _repr or f"<{self.__class__.__name__} limit={limit} path={path!r}>"
+
+    def _windows(self):
+        row = self._db.execute(
+            "SELECT value FROM settings WHERE name = 'hourly_limit'"
+        ).fetchone()
+        self._hourly.limit = int(row[0])
+        return [(window.limit, window.period) for window in self.windows]
+
+    def _count(self, since):
+        return self._db.execute(
+            "SELECT COUNT(*) FROM requests WHERE ts > ?", (since,)
+        ).fetchone()[0]
+
+    @property
+    def limit(self):
+        """:class:`int`: The number of requests allowed per hour."""
+        with self._mutex:
+            return self._windows()[0][0]
+
+    @property
+    def remaining(self):
+        """:class:`int`: The number of requests remaining, across every process sharing this limiter."""
+        now = time.time()
+        with self._mutex:
+            return max(
+                0,
+                min(
+                    limit - self._count(now - period)
+                    for limit, period in self._windows()
+                ),
+            )
+
+    def _snapshot(self):
+        offset = time.time() - time.monotonic()
+        with self._mutex:
+            rows = self._db.execute("SELECT ts FROM requests ORDER BY ts").fetchall()
+            limits = self._windows()
+        windows = []
+        for limit, period in limits:
+            window = RateWindow(limit, period)
+            window._requests = deque(ts - offset for ts, in rows)
+            windows.append(window)
+        return windows
+
+    def _try_admit(self, reserve):
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if not _is_locked(e):
+                raise
+            # randomized, so processes retrying at the same time don't keep colliding
+            return random.uniform(0, 2 * LOCK_RETRY_DELAY)
+        try:
+            now = time.time()
+            windows = self._windows()
+            longest = max(period for _, period in windows)
+            self._db.execute("DELETE FROM requests WHERE ts <= ?", (now - longest,))
+
+            delay = 0.0
+            for limit, period in windows:
+                excess = self._count(now - period) - max(1, limit - reserve)
+                if excess >= 0:
+                    oldest = self._db.execute(
+                        "SELECT ts FROM requests WHERE ts > ? ORDER BY ts LIMIT 1 OFFSET ?",
+                        (now - period, excess),
+                    ).fetchone()[0]
+                    delay = max(delay, oldest + period - now)
+
+            if delay <= 0:
+                self._db.execute("INSERT INTO requests (ts) VALUES (?)", (now,))
+            self._db.execute("COMMIT")
+        except sqlite3.OperationalError as e:
+            self._db.execute("ROLLBACK")
+            if not _is_locked(e):
+                raise
+            return random.uniform(0, 2 * LOCK_RETRY_DELAY)
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        return delay
+
+    def update(self, remaining, limit=None):
+        """Updates the shared state with the rate limit reported by the server.
+
+        Parameters
+        ----------
+        remaining: :class:`int`
+            The value of the ``X-RateLimit-Remaining`` header.
+        limit: :class:`Optional[int]`
+            The value of the ``X-RateLimit-Limit`` header, if present.
+        """
+        logger.debug(f"Updating rate limit: {remaining} requests remaining.")
+        with self._mutex:
+            try:
+                self._db.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                if not _is_locked(e):
+                    raise
+                # the next response reports the state again
+                logger.debug("Rate limit database is locked, skipping the update.")
+                return
+            try:
+                if limit is not None:
+                    self._db.execute(
+                        "UPDATE settings SET value = ? WHERE name = 'hourly_limit'",
+                        (limit,),
+                    )
+                now = time.time()
+                hourly_limit, period = self._windows()[0]
+                unseen = (hourly_limit - remaining) - self._count(now - period)
+                if unseen > 0:
+                    self._db.executemany(
+                        "INSERT INTO requests (ts) VALUES (?)", [(now,)] * unseen
+                    )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._wake_head()
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._mutex:
+            self._db.close()
+
+
+def _is_locked(error):
+    return "locked" in str(error) or "busy" in str(error)
+
+
 default_rate_limiter = RateLimiter(1000, "<default_rate_limiter>")
 insight_rate_limiter = RateLimiter(2000, "<insight_rate_limiter>")
-demo_rate_limiter = RateLimiter(30)  # todo: figure out how to implement daily limit
+# DEMO_KEY is limited to 30 requests per hour and 50 per day.
+demo_rate_limiter = RateLimiter(30, "<demo_rate_limiter>", windows=[(50, 86400)])
@@ -0,0 +1,2 @@
+from .cassette import Cassette, Interaction
+from .server import StubServer
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import logging
+
+from .cassette import Cassette
+from .server import StubServer
+
+__doc__ = """
+
+LOCAL STAND-IN SERVER FOR RECORDED NASA API RESPONSES
+
+"""
+
+
+parser = argparse.ArgumentParser(
+    description="Local stand-in server that records or replays NASA API responses."
+)
+
+parser.add_argument("cassette", help="Path of the cassette file to replay or record.")
+parser.add_argument(
+    "--record",
+    action="store_true",
+    help="Forward requests to the real APIs and record the responses into the cassette.",
+)
+parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+parser.add_argument("--port", type=int, default=8080, help="Port to listen on.")
+parser.add_argument(
+    "--latency",
+    type=float,
+    default=0.0,
+    help="Delay added to every response, in seconds.",
+)
+parser.add_argument(
+    "--bandwidth", type=int, help="Maximum response bandwidth, in bytes per second."
+)
+parser.add_argument(
+    "--rate-limit", type=int, help="Simulated hourly request budget for api.nasa.gov."
+)
+parser.add_argument(
+    "--error-rate",
+    type=float,
+    default=0.0,
+    help="Fraction of requests that fail with a 503 response.",
+)
+
+
+async def main():
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    server = StubServer(
+        Cassette.load(args.cassette),
+        record=args.record,
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+    )
+    async with server:
+        for origin, target in sorted(server.redirects.items()):
+            print(f"{origin} -> {target}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
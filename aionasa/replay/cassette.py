@@ -0,0 +1,158 @@
+import base64
+import json
+import logging
+import os
+from collections import defaultdict
+
+from ..utils import normalize_url
+
+logger = logging.getLogger("aionasa.replay")
+
+# response headers worth keeping in a recording
+RECORDED_HEADERS = {
+    "accept-ranges",
+    "content-md5",
+    "content-type",
+    "etag",
+    "last-modified",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining",
+}
+
+
+class Interaction:
+    """A single recorded HTTP response.
+
+    Attributes
+    ----------
+    url: :class:`str`
+        The normalized request URL (see :func:`aionasa.utils.normalize_url`), without the API key.
+    status: :class:`int`
+        The HTTP status code.
+    reason: :class:`str`
+        The HTTP status reason.
+    headers: :class:`dict`
+        Selected response headers.
+    body: :class:`bytes`
+        The response body.
+    """
+
+    def __init__(self, url, status, reason, headers, body):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} url={self.url!r} status={self.status} size={len(self.body)}>"
+
+    def to_json(self):
+        return {
+            "url": self.url,
+            "status": self.status,
+            "reason": self.reason,
+            "headers": self.headers,
+            "body": base64.b64encode(self.body).decode("ascii"),
+        }
+
+    @classmethod
+    def from_json(cls, json):
+        return cls(
+            json["url"],
+            json["status"],
+            json["reason"],
+            json["headers"],
+            base64.b64decode(json["body"]),
+        )
+
+
+class Cassette:
+    """A collection of recorded responses, stored as a JSON file.
+
+    Responses are looked up by normalized URL, so recordings made with one API key can be
+    replayed with any other. If the same URL was recorded more than once, the recordings are
+    replayed in order, looping back to the first.
+
+    Parameters
+    ----------
+    path: :class:`Optional[str]`
+        The file the cassette is loaded from and saved to.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.interactions = []
+        self._by_url = defaultdict(list)
+        self._cursor = defaultdict(int)
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} path={self.path!r} interactions={len(self)}>"
+        )
+
+    def __len__(self):
+        return len(self.interactions)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a cassette from a file. Returns an empty cassette if the file does not exist."""
+        cassette = cls(path)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            for item in data["interactions"]:
+                cassette._add(Interaction.from_json(item))
+        return cassette
+
+    def save(self, path=None):
+        """Writes the cassette to a file."""
+        path = path or self.path
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "version": 1,
+                    "interactions": [i.to_json() for i in self.interactions],
+                },
+                f,
+            )
+
+    def _add(self, interaction):
+        self.interactions.append(interaction)
+        self._by_url[interaction.url].append(interaction)
+
+    def record(self, url, status, reason, headers, body):
+        """Adds a response to the cassette.
+
+        Parameters
+        ----------
+        url: :class:`str`
+            The request URL. Normalized before it is stored, removing the API key.
+        status: :class:`int`
+            The HTTP status code.
+        reason: :class:`str`
+            The HTTP status reason.
+        headers:
+            The response headers. Only headers relevant to the clients are kept.
+        body: :class:`bytes`
+            The response body.
+        """
+        headers = {k: v for k, v in headers.items() if k.lower() in RECORDED_HEADERS}
+        interaction = Interaction(normalize_url(url), status, reason, headers, body)
+        self._add(interaction)
+        return interaction
+
+    def find(self, url):
+        """Returns the next recorded response for a URL, or ``None`` if it was never recorded."""
+        key = normalize_url(url)
+        matches = self._by_url.get(key)
+        if not matches:
+            return None
+        index = self._cursor[key] % len(matches)
+        self._cursor[key] += 1
+        return matches[index]
+
+    @property
+    def origins(self):
+        """:class:`Set[str]`: The scheme and host of every URL in the cassette."""
+        return {"/".join(i.url.split("/")[:3]) for i in self.interactions}
@@ -0,0 +1,290 @@
+import asyncio
+import functools
+import logging
+import random
+import socket
+import time
+
+import aiohttp
+from aiohttp import web
+
+from .cassette import Cassette
+
+logger = logging.getLogger("aionasa.replay")
+
+# Hosts the library talks to. Redirects are generated for all of these.
+DEFAULT_ORIGINS = (
+    "https://api.nasa.gov",
+    "https://apod.nasa.gov",
+    "http://apod.nasa.gov",
+    "https://epic.gsfc.nasa.gov",
+    "https://exoplanetarchive.ipac.caltech.edu",
+)
+
+# Requests to these hosts count against the simulated rate limit.
+RATE_LIMITED_HOSTS = {"api.nasa.gov"}
+
+
+class StubServer:
+    """Local stand-in for the NASA APIs that replays (or records) responses from a :class:`Cassette`.
+
+    Requests are made to ``http://<host>:<port>/<scheme>/<original host>/<original path>``.
+    Pass :attr:`redirects` as the ``redirects`` argument of any client to point it at the server.
+
+    In record mode, the first request for each URL is forwarded to the real upstream URL, and the response
+    is added to the cassette before being returned. Later requests for it, including ``HEAD`` and ``Range``
+    requests, are served from the recording.
+
+    Requests for recordings with an ``Accept-Ranges: bytes`` header may use ``Range`` headers (honouring
+    ``If-Range``), and get ``206 Partial Content`` responses like a real file server. Conditional requests
+    matching a recording's ``ETag`` or ``Last-Modified`` header get ``304 Not Modified`` responses.
+
+    Parameters
+    ----------
+    cassette: :class:`Cassette`
+        The cassette to replay from (or record into).
+    record: :class:`bool`
+        Whether to forward requests upstream and record the responses.
+    host: :class:`str`
+        The interface to listen on.
+    port: :class:`int`
+        The port to listen on. ``0`` picks a free port.
+    latency: :class:`Union[float, Tuple[float, float]]`
+        Delay added before every response, in seconds. A ``(min, max)`` tuple picks a random delay in that range.
+    bandwidth: :class:`Optional[int]`
+        Maximum rate each response body is sent at, in bytes per second.
+    rate_limit: :class:`Optional[int]`
+        Simulated hourly request budget for api.nasa.gov. Sent in ``X-RateLimit-Limit``/``X-RateLimit-Remaining``
+        headers, and requests beyond the budget get a 429 response.
+    error_rate: :class:`float`
+        Fraction of requests that fail with a 503 response.
+    seed: :class:`Optional[int]`
+        Seed for the random latency and error injection, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        cassette,
+        record=False,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        bandwidth=None,
+        rate_limit=None,
+        error_rate=0.0,
+        seed=None,
+    ):
+        self.cassette = cassette
+        self.record = record
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._remaining = rate_limit
+        self._window_start = time.monotonic()
+        self._runner = None
+        self._upstream = None
+        self._recording = {}  # url -> task recording it
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} url={self.url!r} record={self.record} requests={self.requests}>"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def url(self):
+        """:class:`str`: The server's base URL."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def redirects(self):
+        """:class:`dict`: Client ``redirects`` mapping that routes every known NASA host through this server."""
+        origins = set(DEFAULT_ORIGINS) | self.cassette.origins
+        return {
+            origin: f"{self.url}/{origin.replace('://', '/', 1)}" for origin in origins
+        }
+
+    async def start(self):
+        """Starts listening for requests."""
+        app = web.Application()
+        app.router.add_get("/{scheme}/{host}/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+        await web.SockSite(self._runner, sock).start()
+
+        if self.record:
+            self._upstream = aiohttp.ClientSession()
+        logger.info(f"Stub server listening on {self.url}")
+
+    async def close(self):
+        """Stops the server. In record mode, also saves the cassette."""
+        if self._upstream:
+            await self._upstream.close()
+            self._upstream = None
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        if self.record and self.cassette.path:
+            self.cassette.save()
+
+    def _rate_limit_headers(self, host):
+        if self.rate_limit is None or host not in RATE_LIMITED_HOSTS:
+            return {}, True
+        if time.monotonic() - self._window_start >= 3600:
+            self._window_start = time.monotonic()
+            self._remaining = self.rate_limit
+        allowed = self._remaining > 0
+        if allowed:
+            self._remaining -= 1
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self._remaining),
+        }
+        return headers, allowed
+
+    async def _handle(self, request):
+        self.requests += 1
+        scheme = request.match_info["scheme"]
+        host = request.match_info["host"]
+        url = f"{scheme}://{host}/{request.match_info['path']}"
+        if request.query_string:
+            url += f"?{request.query_string}"
+
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+        if latency:
+            await asyncio.sleep(latency)
+
+        headers, allowed = self._rate_limit_headers(host)
+        if not allowed:
+            return web.Response(status=429, reason="Too Many Requests", headers=headers)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.Response(
+                status=503, reason="Service Unavailable", headers=headers
+            )
+
+        interaction = self.cassette.find(url)
+        if interaction is None and self.record:
+            interaction = await self._record(url)
+        if interaction is None:
+            logger.warning(f"No recording for {url}")
+            return web.Response(status=404, reason="Not Recorded", headers=headers)
+
+        headers = {**interaction.headers, **headers}
+        return await self._send_body(
+            request, interaction.status, interaction.reason, headers, interaction.body
+        )
+
+    async def _record(self, url):
+        # concurrent requests for the same URL (e.g. the segments of a download) share one upstream request
+        task = self._recording.get(url)
+        if task is None:
+            task = self._recording[url] = asyncio.ensure_future(self._fetch(url))
+            task.add_done_callback(functools.partial(self._recorded, url))
+        return await asyncio.shield(task)
+
+    def _recorded(self, url, task):
+        self._recording.pop(url, None)
+        if not task.cancelled():
+            # retrieved here in case every request for the URL disconnected
+            task.exception()
+
+    async def _fetch(self, url):
+        async with self._upstream.get(url) as response:
+            body = await response.read()
+            logger.info(f"Recorded {response.status} {url} ({len(body)} bytes)")
+            return self.cassette.record(
+                url, response.status, response.reason, response.headers, body
+            )
+
+    @staticmethod
+    def _byte_range(request, headers, size):
+        """Returns the ``(start, end)`` of a satisfiable ``Range: bytes=`` request, if the recording accepts ranges."""
+        header = request.headers.get("Range", "")
+        if headers.get("Accept-Ranges", "").lower() != "bytes" or not header.startswith(
+            "bytes="
+        ):
+            return None
+        if_range = request.headers.get("If-Range")
+        if if_range is not None:
+            # the range only applies to the same version of the file; otherwise the whole file is sent
+            etag = headers.get("ETag")
+            if if_range.startswith('"') or if_range.startswith("W/"):
+                if not etag or etag.startswith("W/") or if_range != etag:
+                    return None
+            elif if_range != headers.get("Last-Modified"):
+                return None
+        start, _, end = header[len("bytes=") :].partition("-")
+        try:
+            if not start:  # suffix range, e.g. "bytes=-500"
+                start, end = max(0, size - int(end)), size - 1
+            else:
+                start, end = int(start), min(int(end) if end else size - 1, size - 1)
+        except ValueError:
+            return None
+        if start > end:
+            return None
+        return start, end
+
+    @staticmethod
+    def _not_modified(request, headers):
+        """Returns whether a conditional request's validators match the recording."""
+        etag = headers.get("ETag")
+        if_none_match = request.headers.get("If-None-Match")
+        if etag and if_none_match:
+            return etag in (tag.strip() for tag in if_none_match.split(","))
+        last_modified = headers.get("Last-Modified")
+        return (
+            bool(last_modified)
+            and request.headers.get("If-Modified-Since") == last_modified
+        )
+
+    async def _send_body(self, request, status, reason, headers, body):
+        if status == 200 and self._not_modified(request, headers):
+            return web.Response(status=304, reason="Not Modified", headers=headers)
+        if status == 200:
+            byte_range = self._byte_range(request, headers, len(body))
+            if byte_range is not None:
+                start, end = byte_range
+                status, reason = 206, "Partial Content"
+                headers = {
+                    **headers,
+                    "Content-Range": f"bytes {start}-{end}/{len(body)}",
+                }
+                body = body[start : end + 1]
+
+        response = web.StreamResponse(status=status, reason=reason, headers=headers)
+        response.content_length = len(body)
+        try:
+            await response.prepare(request)
+            if request.method == "HEAD":
+                return response
+
+            if not self.bandwidth:
+                await response.write(body)
+            else:
+                chunk_size = max(1024, self.bandwidth // 20)
+                for i in range(0, len(body), chunk_size):
+                    chunk = body[i : i + chunk_size]
+                    await response.write(chunk)
+                    await asyncio.sleep(len(chunk) / self.bandwidth)
+            await response.write_eof()
+        except ConnectionError:
+            # the client stopped reading, e.g. a stream that was closed early
+            logger.debug(f"Client disconnected from {request.path}")
+        return response
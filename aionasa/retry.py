@@ -0,0 +1,144 @@
+import asyncio
+import datetime
+import email.utils
+import logging
+import random
+
+import aiohttp
+
+from .errors import APIException
+
+logger = logging.getLogger("aionasa.retry")
+
+
+class RetryPolicy:
+    """Configures how failed requests are retried.
+
+    Failed attempts are retried with exponential backoff and full jitter. If the server sends a
+    ``Retry-After`` header, it is used instead of the computed backoff.
+
+    Parameters
+    ----------
+    max_attempts: :class:`int`
+        Maximum number of attempts per request, including the first one.
+    backoff_base: :class:`float`
+        Delay before the first retry, in seconds. Doubles on every following attempt.
+    backoff_max: :class:`float`
+        Upper bound for the computed backoff delay, in seconds.
+    jitter: :class:`bool`
+        Whether to randomize delays between zero and the computed backoff,
+        so that many failed requests don't all retry at the same moment.
+    statuses: :class:`Iterable[int]`
+        HTTP status codes that are safe to retry.
+    retry_on_connection_errors: :class:`bool`
+        Whether to retry on connection errors, truncated responses and timeouts.
+    max_retry_after: :class:`float`
+        Longest ``Retry-After`` delay that will be waited out, in seconds.
+        If the server asks for a longer wait, the error is raised instead.
+
+    Attributes
+    ----------
+    retries: :class:`int`
+        Total number of retries performed under this policy.
+    failures: :class:`int`
+        Number of requests that still failed after retrying.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff_base=0.5,
+        backoff_max=30.0,
+        jitter=True,
+        statuses=(408, 429, 500, 502, 503, 504),
+        retry_on_connection_errors=True,
+        max_retry_after=120.0,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.retry_on_connection_errors = retry_on_connection_errors
+        self.max_retry_after = max_retry_after
+        self.retries = 0
+        self.failures = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} max_attempts={self.max_attempts} retries={self.retries} failures={self.failures}>"
+
+    def backoff(self, attempt):
+        """Returns the delay before retrying after the given (1-indexed) failed attempt."""
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Parses a ``Retry-After`` header value into a number of seconds.
+        Returns ``None`` if the value is missing or malformed.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return max(0.0, (when - now).total_seconds())
+
+    def _delay_for(self, error, attempt):
+        """Returns the delay before retrying after ``error``, or ``None`` if it should not be retried."""
+        if attempt >= self.max_attempts:
+            return None
+
+        if isinstance(error, APIException):
+            if error.code not in self.statuses:
+                return None
+            retry_after = self.parse_retry_after(error.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_retry_after else None
+            return self.backoff(attempt)
+
+        if self.retry_on_connection_errors:
+            return self.backoff(attempt)
+        return None
+
+    async def run(self, func, *args, **kwargs):
+        """Calls a coroutine function, retrying it according to this policy.
+
+        Parameters
+        ----------
+        func:
+            The coroutine function to call. Each call is one attempt.
+
+        Returns
+        -------
+            Whatever ``func`` returns.
+        """
+        attempt = 1
+        while True:
+            try:
+                return await func(*args, **kwargs)
+            except (
+                APIException,
+                aiohttp.ClientConnectionError,
+                aiohttp.ClientPayloadError,
+                asyncio.TimeoutError,
+            ) as e:
+                delay = self._delay_for(e, attempt)
+                if delay is None:
+                    if attempt > 1:
+                        self.failures += 1
+                    raise
+                logger.debug(
+                    f"Attempt {attempt} failed ({e.__class__.__name__}: {e}), retrying in {delay:.2f} seconds."
+                )
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
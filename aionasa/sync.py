@@ -0,0 +1,252 @@
+import asyncio
+import atexit
+import functools
+import inspect
+import logging
+import threading
+
+from .apod.api import APOD
+from .asset import Asset, AssetStream
+from .epic.api import EPIC
+from .exoplanet.api import Exoplanet
+from .insight.api import InSight
+from .neows.api import NeoWs
+from .neows.paginators import NeoWsBrowsePage, NeoWsFeedPage
+
+logger = logging.getLogger("aionasa.sync")
+
+# results of these types have coroutine methods of their own, so they get wrapped too
+_WRAPPED_RESULTS = (Asset, NeoWsFeedPage, NeoWsBrowsePage)
+
+
+class LoopThread:
+    """An event loop running forever in a background daemon thread.
+
+    Coroutines can be submitted from any thread with :meth:`run`, which blocks until they complete.
+    Every synchronous client attached to the same LoopThread shares its loop, so sessions,
+    connection pools and rate limiter state stay warm between calls.
+    """
+
+    def __init__(self, name="aionasa-loop"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} name={self.name!r} running={self.running}>"
+
+    @property
+    def running(self):
+        """:class:`bool`: Whether the loop thread is currently running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self):
+        """:class:`asyncio.AbstractEventLoop`: The background event loop. Starts the thread if needed."""
+        self.start()
+        return self._loop
+
+    def start(self):
+        """Starts the background thread, if it isn't running already."""
+        with self._lock:
+            if self.running:
+                return
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_forever, args=(ready,), name=self.name, daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+
+    def _run_forever(self, ready):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def run(self, coro, timeout=None):
+        """Runs a coroutine on the background loop and blocks until it completes.
+
+        Parameters
+        ----------
+        coro:
+            The coroutine to run.
+        timeout: :class:`Optional[float]`
+            Maximum number of seconds to wait for the result.
+
+        Returns
+        -------
+            The coroutine's result.
+        """
+        if self._thread is threading.current_thread():
+            raise RuntimeError(
+                "LoopThread.run() cannot be called from the loop's own thread."
+            )
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self):
+        """Stops the loop and waits for the thread to exit."""
+        with self._lock:
+            if not self.running:
+                return
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._thread = None
+            self._loop = None
+
+
+_default_loop_thread = None
+_default_lock = threading.Lock()
+
+
+def default_loop_thread():
+    """Returns the :class:`LoopThread` shared by synchronous clients by default."""
+    global _default_loop_thread
+    with _default_lock:
+        if _default_loop_thread is None:
+            _default_loop_thread = LoopThread()
+            atexit.register(_default_loop_thread.stop)
+        return _default_loop_thread
+
+
+class _SyncProxy:
+    """Wraps an object so its coroutine methods block on a LoopThread instead."""
+
+    def __init__(self, wrapped, loop_thread):
+        self._wrapped = wrapped
+        self._loop_thread = loop_thread
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self._wrapped!r}>"
+
+    def __str__(self):
+        return str(self._wrapped)
+
+    def __getattr__(self, name):
+        attr = getattr(self._wrapped, name)
+        if not inspect.iscoroutinefunction(attr):
+            if not inspect.ismethod(attr):
+                return attr
+
+            # e.g. Asset.stream, whose result needs the loop to be iterated
+            @functools.wraps(attr)
+            def wrapped(*args, **kwargs):
+                return self._wrap(attr(*args, **kwargs))
+
+            return wrapped
+
+        @functools.wraps(attr)
+        def blocking(*args, **kwargs):
+            result = self._loop_thread.run(attr(*args, **kwargs))
+            return self._wrap(result)
+
+        return blocking
+
+    def _wrap(self, result):
+        if isinstance(result, AssetStream):
+            return _SyncStream(result, self._loop_thread)
+        if isinstance(result, _WRAPPED_RESULTS):
+            return _SyncProxy(result, self._loop_thread)
+        if isinstance(result, list):
+            return [self._wrap(item) for item in result]
+        return result
+
+
+class _SyncStream(_SyncProxy):
+    """Wraps an :class:`AssetStream` in a blocking iterator, reading each chunk on a LoopThread."""
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return self._loop_thread.run(self._wrapped.__anext__())
+        except StopAsyncIteration:
+            raise StopIteration from None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Closes the stream, releasing its connection."""
+        self._loop_thread.run(self._wrapped.aclose())
+
+
+class SyncClient(_SyncProxy):
+    """Blocking facade over an async API client.
+
+    The wrapped client is created on, and only ever used from, a background event loop
+    (see :class:`LoopThread`), so its session and rate limiter are reused between calls.
+    Any coroutine method of the client can be called directly and blocks until it completes,
+    and is safe to call from many threads at once. Returned assets and pages are wrapped the same way,
+    and :meth:`Asset.stream` returns a blocking iterator instead of an async one:
+
+    .. code-block:: python
+
+        with picture.stream() as chunks:
+            for chunk in chunks:
+                ...
+
+    Subclasses set ``client_class``; arguments are passed through to it.
+
+    Parameters
+    ----------
+    loop_thread: :class:`Optional[LoopThread]`
+        The loop to run the client on. Uses a library-wide shared loop by default.
+    """
+
+    client_class = None
+
+    def __init__(self, *args, loop_thread=None, **kwargs):
+        loop_thread = loop_thread or default_loop_thread()
+        client = loop_thread.run(self._create(*args, **kwargs))
+        super().__init__(client, loop_thread)
+
+    async def _create(self, *args, **kwargs):
+        return self.client_class(*args, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SyncAPOD(SyncClient):
+    """Blocking facade over :class:`APOD`."""
+
+    client_class = APOD
+
+
+class SyncEPIC(SyncClient):
+    """Blocking facade over :class:`EPIC`."""
+
+    client_class = EPIC
+
+
+class SyncNeoWs(SyncClient):
+    """Blocking facade over :class:`NeoWs`."""
+
+    client_class = NeoWs
+
+
+class SyncExoplanet(SyncClient):
+    """Blocking facade over :class:`Exoplanet`."""
+
+    client_class = Exoplanet
+
+
+class SyncInSight(SyncClient):
+    """Blocking facade over :class:`InSight`."""
+
+    client_class = InSight
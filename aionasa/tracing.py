@@ -0,0 +1,214 @@
+import logging
+import time
+from collections import deque
+
+import aiohttp
+
+from .utils import normalize_url
+
+logger = logging.getLogger("aionasa.tracing")
+
+
+class RequestTrace:
+    """Timing breakdown of a single API request. All durations are in seconds,
+    and are ``None`` for phases that did not happen (e.g. DNS lookups served from cache).
+
+    Attributes
+    ----------
+    endpoint: :class:`str`
+        Name of the API the request was made to (``'apod'``, ``'epic'``, ``'neows'``, ``'exoplanet'``, ``'insight'``).
+    url: :class:`str`
+        The normalized request URL, without the API key.
+    status: :class:`Optional[int]`
+        The HTTP status of the response, if one was received.
+    error: :class:`Optional[str]`
+        Name of the exception raised by the request, if any.
+    rate_limit_wait:
+        Time spent waiting on the client's rate limiter.
+    connection_queued:
+        Time spent waiting for a free connection in the pool.
+    dns:
+        Time spent resolving the host name.
+    connect:
+        Time spent opening a new connection, including the TLS handshake.
+    ttfb:
+        Time from sending the request to receiving the response headers,
+        excluding time spent waiting for or opening a connection.
+    body_read:
+        Time spent reading the response body.
+    total:
+        Total time spent on the request, including the rate limiter wait.
+    """
+
+    __slots__ = (
+        "endpoint",
+        "url",
+        "status",
+        "error",
+        "rate_limit_wait",
+        "connection_queued",
+        "dns",
+        "connect",
+        "ttfb",
+        "body_read",
+        "total",
+        "_start",
+        "_marks",
+    )
+
+    def __init__(self, endpoint, url):
+        self.endpoint = endpoint
+        self.url = normalize_url(url)
+        self.status = None
+        self.error = None
+        self.rate_limit_wait = None
+        self.connection_queued = None
+        self.dns = None
+        self.connect = None
+        self.ttfb = None
+        self.body_read = None
+        self.total = None
+        self._start = time.monotonic()
+        self._marks = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} endpoint={self.endpoint!r} status={self.status} total={self.total}>"
+
+    def _mark(self, name):
+        self._marks[name] = time.monotonic()
+
+    def _since(self, name):
+        start = self._marks.get(name)
+        return time.monotonic() - start if start is not None else None
+
+    def to_dict(self):
+        """Returns the trace as a plain dict, suitable for logging or shipping to a metrics system."""
+        return {name: getattr(self, name) for name in self.__slots__ if name[0] != "_"}
+
+
+class Tracer:
+    """Collects a :class:`RequestTrace` for every request made by the clients it is attached to.
+
+    Pass a tracer to a client's ``tracer`` argument. Connection-level phases (pool wait, DNS, connect, TTFB)
+    are only available for sessions created with :meth:`trace_config` attached, which clients and
+    :class:`Transport` objects do automatically when given a tracer.
+
+    Parameters
+    ----------
+    slow_threshold: :class:`Optional[float]`
+        Requests taking at least this many seconds are logged as warnings.
+    history: :class:`int`
+        Number of recent traces to keep in :attr:`records`.
+    hooks: :class:`Optional[List[Callable[[RequestTrace], None]]]`
+        Functions called with every finished trace, e.g. to forward it to a metrics system.
+
+    Attributes
+    ----------
+    records: :class:`Deque[RequestTrace]`
+        The most recent traces.
+    """
+
+    def __init__(self, slow_threshold=None, history=1000, hooks=None):
+        self.slow_threshold = slow_threshold
+        self.records = deque(maxlen=history)
+        self.hooks = list(hooks or [])
+        self._trace_config = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} records={len(self.records)} hooks={len(self.hooks)}>"
+
+    def add_hook(self, hook):
+        """Registers a function to be called with every finished :class:`RequestTrace`."""
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        """Unregisters a function added with :meth:`add_hook`."""
+        self.hooks.remove(hook)
+
+    def start(self, endpoint, url):
+        """Starts tracing a request."""
+        return RequestTrace(endpoint, url)
+
+    def finish(self, trace, status=None, error=None):
+        """Completes a trace and passes it to the hooks."""
+        trace.total = time.monotonic() - trace._start
+        trace.status = status
+        trace.error = error.__class__.__name__ if error is not None else None
+        self.records.append(trace)
+
+        if self.slow_threshold is not None and trace.total >= self.slow_threshold:
+            logger.warning(
+                f"Slow {trace.endpoint} request ({trace.total:.3f}s): {trace.url} "
+                f"rate_limit_wait={trace.rate_limit_wait} connection_queued={trace.connection_queued} "
+                f"dns={trace.dns} connect={trace.connect} ttfb={trace.ttfb} body_read={trace.body_read}"
+            )
+
+        for hook in self.hooks:
+            try:
+                hook(trace)
+            except Exception:
+                logger.exception(f"Tracer hook {hook!r} raised an exception.")
+
+    def trace_config(self):
+        """Returns an :class:`aiohttp.TraceConfig` that fills in connection-level phases.
+        Must be attached to the session the traced clients use.
+        """
+        if self._trace_config is None:
+            self._trace_config = _build_trace_config()
+        return self._trace_config
+
+
+def _build_trace_config():
+    def handler(func):
+        async def wrapper(session, ctx, params):
+            trace = ctx.trace_request_ctx
+            if isinstance(trace, RequestTrace):
+                func(trace)
+
+        return wrapper
+
+    @handler
+    def on_request_start(trace):
+        trace._mark("request")
+
+    @handler
+    def on_connection_queued_start(trace):
+        trace._mark("queued")
+
+    @handler
+    def on_connection_queued_end(trace):
+        trace.connection_queued = trace._since("queued")
+
+    @handler
+    def on_dns_resolvehost_start(trace):
+        trace._mark("dns")
+
+    @handler
+    def on_dns_resolvehost_end(trace):
+        trace.dns = trace._since("dns")
+
+    @handler
+    def on_connection_create_start(trace):
+        trace._mark("connect")
+
+    @handler
+    def on_connection_create_end(trace):
+        trace.connect = trace._since("connect")
+
+    @handler
+    def on_request_end(trace):
+        elapsed = trace._since("request")
+        if elapsed is not None:
+            setup = (trace.connection_queued or 0) + (trace.connect or 0)
+            trace.ttfb = max(0.0, elapsed - setup)
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_connection_queued_start.append(on_connection_queued_start)
+    config.on_connection_queued_end.append(on_connection_queued_end)
+    config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    config.on_connection_create_start.append(on_connection_create_start)
+    config.on_connection_create_end.append(on_connection_create_end)
+    config.on_request_end.append(on_request_end)
+    return config
@@ -0,0 +1,127 @@
+import logging
+import ssl
+
+import aiohttp
+
+logger = logging.getLogger("aionasa.transport")
+
+
+class Transport:
+    """A connection pool that can be shared between multiple API clients.
+
+    Every client attached to the same Transport reuses one :class:`aiohttp.ClientSession`,
+    so connections (and their DNS lookups and TLS handshakes) to api.nasa.gov are kept warm
+    across APOD, EPIC, NeoWs, etc. instead of each client opening its own pool.
+
+    The underlying session is created when the first client attaches and closed
+    when the last attached client is closed.
+
+    Parameters
+    ----------
+    limit: :class:`int`
+        Total number of simultaneous connections. ``0`` means no limit.
+    limit_per_host: :class:`int`
+        Number of simultaneous connections to a single host. ``0`` means no limit.
+    keepalive_timeout: :class:`float`
+        Number of seconds an idle connection is kept open for reuse.
+    ttl_dns_cache: :class:`Optional[int]`
+        Number of seconds resolved hosts are cached for. ``None`` caches forever.
+    ssl_context: :class:`Optional[ssl.SSLContext]`
+        SSL context shared by every connection in the pool, so certificates are only loaded once.
+        A default context is created if this is left out.
+    timeout: :class:`Optional[aiohttp.ClientTimeout]`
+        Timeout settings for the underlying session.
+    trace_configs: :class:`Optional[List[aiohttp.TraceConfig]]`
+        Trace configs to attach to the underlying session.
+    tracer: :class:`Optional[Tracer]`
+        Tracer to collect connection-level timing for. Clients attached to this transport
+        still need the same tracer passed as their ``tracer`` argument.
+
+    Clients attached to a Transport use its ``timeout`` and ``tracer``: passing a different ``timeout``
+    or ``tracer`` to such a client raises :exc:`ArgumentError`.
+    """
+
+    def __init__(
+        self,
+        limit=100,
+        limit_per_host=0,
+        keepalive_timeout=30.0,
+        ttl_dns_cache=300,
+        ssl_context=None,
+        timeout=None,
+        trace_configs=None,
+        tracer=None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.timeout = timeout or aiohttp.ClientTimeout()
+        self.trace_configs = list(trace_configs or [])
+        self.tracer = tracer
+        if tracer:
+            self.trace_configs.append(tracer.trace_config())
+        self._session = None
+        self._refcount = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} refcount={self._refcount} limit={self.limit} limit_per_host={self.limit_per_host}>"
+
+    @property
+    def refcount(self):
+        """:class:`int`: The number of clients currently attached to this transport."""
+        return self._refcount
+
+    @property
+    def session(self):
+        """:class:`Optional[aiohttp.ClientSession]`: The shared session, if one is open."""
+        return self._session
+
+    def _create_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+            ssl=self.ssl_context,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            trace_configs=self.trace_configs or None,
+        )
+
+    def acquire(self):
+        """Attaches a client to this transport.
+
+        Returns
+        -------
+        :class:`aiohttp.ClientSession`
+            The shared session. Opens a new one if no session is currently open.
+        """
+        if self._session is None or self._session.closed:
+            logger.debug("Opening shared transport session.")
+            self._session = self._create_session()
+        self._refcount += 1
+        return self._session
+
+    async def release(self):
+        """Detaches a client from this transport.
+        The shared session is closed once no clients remain attached.
+        """
+        if self._refcount < 1:
+            return
+        self._refcount -= 1
+        if self._refcount == 0 and self._session is not None:
+            logger.debug("Closing shared transport session.")
+            await self._session.close()
+            self._session = None
+
+    async def close(self):
+        """Closes the shared session regardless of how many clients are attached."""
+        self._refcount = 0
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -1,4 +1,5 @@
 from datetime import date, datetime, timedelta
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 
 def date_strptime(date_string):
@@ -44,3 +45,26 @@ def datetime_strptime(date_string, seconds=False):
         return datetime.strptime(date_string, "%Y-%m-%d %H:%M:%S")
     else:
         return datetime.strptime(date_string, "%Y-%m-%d %H:%M")
+
+
+def normalize_url(url):
+    """Converts a request URL into a stable key for caching and request deduplication.
+
+    The scheme and host are lowercased, query parameters are sorted,
+    and the ``api_key`` parameter is removed so the key does not depend on which key was used.
+
+    Parameters
+    ----------
+    url: :class:`str`
+        The URL to normalize.
+
+    Returns
+    -------
+    :class:`str`
+        The normalized URL.
+    """
+    scheme, netloc, path, query, _ = urlsplit(url)
+    params = sorted(
+        (k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k != "api_key"
+    )
+    return urlunsplit((scheme.lower(), netloc.lower(), path, urlencode(params), ""))
@@ -0,0 +1,63 @@
+"""
+Asset download throughput against a local stub server.
+"""
+
+import os
+import tempfile
+import time
+
+import payloads
+
+from aionasa import Asset, AssetCache, BaseClient
+from aionasa.replay import StubServer
+
+ASSET_URL = "https://apod.nasa.gov/apod/image/bench.jpg"
+
+
+async def _measure(results, name, func, iterations, asset_size):
+    await func()  # warm up the connection
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    elapsed = time.perf_counter() - start
+    results[name] = {
+        "count": iterations,
+        "bytes": asset_size,
+        "mb_per_sec": asset_size * iterations / elapsed / 1e6,
+    }
+
+
+async def run(iterations, asset_size, bandwidth=None):
+    cassette = payloads.build_cassette(asset_size=asset_size)
+    results = {}
+
+    async with StubServer(cassette, bandwidth=bandwidth) as server:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.jpg")
+
+            async with BaseClient(redirects=server.redirects) as client:
+                asset = Asset(client, ASSET_URL, "bench.jpg")
+                for name, func in {
+                    "Asset.save": lambda: asset.save(path),
+                    "Asset.save (4 segments)": lambda: asset.save(path, segments=4),
+                    "Asset.read": asset.read,
+                    "Asset.read (zero_copy)": lambda: asset.read(zero_copy=True),
+                }.items():
+                    await _measure(results, name, func, iterations, asset_size)
+
+            # served from local disk; mapped reads don't touch the file's pages until they are used
+            cache = AssetCache(os.path.join(directory, "assets"), ttl=None)
+            async with BaseClient(
+                redirects=server.redirects, asset_cache=cache
+            ) as client:
+                asset = Asset(client, ASSET_URL, "bench.jpg")
+                for name, func in {
+                    "Asset.read (AssetCache)": asset.read,
+                    "Asset.read (AssetCache, zero_copy)": lambda: asset.read(
+                        zero_copy=True
+                    ),
+                }.items():
+                    await _measure(results, name, func, iterations, asset_size)
+            cache.close()
+
+    return results
@@ -0,0 +1,54 @@
+"""
+Requests/sec and latency of each client method against a local stub server.
+"""
+
+import datetime
+
+import payloads
+from common import measure_async
+
+from aionasa import APOD, EPIC, Exoplanet, InSight, NeoWs
+from aionasa.replay import StubServer
+
+DAY = payloads.START_DATE
+
+
+def cases(apod, epic, neows, insight, exoplanet):
+    return {
+        "apod.get": lambda: apod.get(DAY),
+        "apod.batch_get": lambda: apod.batch_get(
+            DAY, DAY + datetime.timedelta(days=29)
+        ),
+        "epic.natural_images": lambda: epic.natural_images(DAY),
+        "epic.natural_listing": epic.natural_listing,
+        "neows.feed": lambda: neows.feed(DAY),
+        "neows.lookup": lambda: neows.lookup(2000001),
+        "insight.get": insight.get,
+        "exoplanet.query_json": lambda: exoplanet.query_json(
+            "exoplanets", select="pl_hostname,ra,dec"
+        ),
+    }
+
+
+async def run(iterations, concurrency, latency=0.0):
+    cassette = payloads.build_cassette(asset_size=1024)
+    results = {}
+
+    async with StubServer(cassette, latency=latency) as server:
+        kwargs = {"redirects": server.redirects, "rate_limiter": None}
+        apod = APOD(**kwargs)
+        epic = EPIC(**kwargs)
+        neows = NeoWs(**kwargs)
+        insight = InSight(**kwargs)
+        exoplanet = Exoplanet(redirects=server.redirects)
+        clients = [apod, epic, neows, insight, exoplanet]
+
+        try:
+            for name, func in cases(*clients).items():
+                await func()  # warm up the connection
+                results[name] = await measure_async(func, iterations, concurrency)
+        finally:
+            for client in clients:
+                await client.close()
+
+    return results
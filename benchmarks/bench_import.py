@@ -0,0 +1,52 @@
+"""
+Cold-start import time of the package, measured in fresh interpreter processes.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = {
+    "python (baseline)": "pass",
+    "import aionasa": "import aionasa",
+    "from aionasa import APOD": "from aionasa import APOD",
+    "from aionasa import Exoplanet": "from aionasa import Exoplanet",
+    "import aionasa.apod.__main__": "import aionasa.apod.__main__",
+}
+
+TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def time_statement(statement, runs):
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="")
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        samples.append(float(output))
+    return samples
+
+
+async def run(runs):
+    results = {}
+    for name, statement in STATEMENTS.items():
+        samples = time_statement(statement, runs)
+        results[name] = {
+            "count": runs,
+            "median_ms": statistics.median(samples) * 1000,
+            "min_ms": min(samples) * 1000,
+        }
+    return results
@@ -0,0 +1,47 @@
+"""
+Object-construction cost of the data classes on large payloads.
+"""
+
+import payloads
+from common import measure
+
+from aionasa import APOD, EPIC, NeoWs
+from aionasa.apod.data import AstronomyPicture
+from aionasa.epic.data import EarthImage
+from aionasa.neows.data import Asteroid, OrbitalData
+from aionasa.neows.paginators import NeoWsFeedPage
+
+
+async def run(iterations):
+    apod = APOD(rate_limiter=None)
+    epic = EPIC()
+    neows = NeoWs(rate_limiter=None)
+
+    apod_json = payloads.apod(payloads.START_DATE)
+    epic_json = [payloads.epic_image(payloads.START_DATE, i) for i in range(100)]
+    asteroid_json = payloads.asteroid(1, approaches=200)
+    feed_json = payloads.feed(days=7, per_day=50)
+
+    try:
+        return {
+            "AstronomyPicture": measure(
+                lambda: AstronomyPicture(apod, payloads.START_DATE, apod_json),
+                iterations,
+            ),
+            "EarthImage x100": measure(
+                lambda: [EarthImage(epic, item, "natural") for item in epic_json],
+                iterations,
+            ),
+            "Asteroid (200 approaches)": measure(
+                lambda: Asteroid(asteroid_json), iterations
+            ),
+            "OrbitalData": measure(
+                lambda: OrbitalData(asteroid_json["orbital_data"]), iterations
+            ),
+            "NeoWsFeedPage (350 asteroids)": measure(
+                lambda: NeoWsFeedPage(neows, feed_json), max(1, iterations // 10)
+            ),
+        }
+    finally:
+        for client in (apod, epic, neows):
+            await client.close()
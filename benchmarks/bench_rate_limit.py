@@ -0,0 +1,107 @@
+"""
+Overhead of RateLimiter.wait when many tasks share one limiter, and its behaviour when the limiter is
+shared by event loops running in several threads.
+"""
+
+import asyncio
+import threading
+import time
+
+from aionasa import RateLimiter
+
+
+def _in_threads(threads, target):
+    """Runs ``target(index)`` in each of ``threads`` threads, each with its own event loop."""
+    barrier = threading.Barrier(threads)
+
+    def run(index):
+        barrier.wait()
+        asyncio.run(target(index))
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def _jain_index(values):
+    """Jain's fairness index: 1.0 when every thread got the same share, 1/n when one thread got everything."""
+    total = sum(values)
+    if not total:
+        return 0.0
+    return total**2 / (len(values) * sum(value**2 for value in values))
+
+
+async def run(tasks, calls_per_task, threads=4):
+    results = {}
+
+    for concurrency in (1, tasks):
+        # large enough that the limiter never has to sleep, so only its own overhead is measured
+        limiter = RateLimiter(concurrency * calls_per_task * 2)
+
+        async def worker():
+            for _ in range(calls_per_task):
+                await limiter.wait()
+                limiter.update(limiter.remaining)
+
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        elapsed = time.perf_counter() - start
+        calls = concurrency * calls_per_task
+        results[f"RateLimiter.wait ({concurrency} tasks)"] = {
+            "count": calls,
+            "ops_per_sec": calls / elapsed,
+            "mean_us": elapsed / calls * 1e6,
+        }
+
+    # the same, with the limiter shared by one event loop per thread
+    tasks_per_thread = max(1, tasks // threads)
+    calls = threads * tasks_per_thread * calls_per_task
+    limiter = RateLimiter(calls * 2)
+
+    async def unthrottled(index):
+        async def worker():
+            for _ in range(calls_per_task):
+                await limiter.wait()
+
+        await asyncio.gather(*[worker() for _ in range(tasks_per_thread)])
+
+    elapsed = await asyncio.get_running_loop().run_in_executor(
+        None, _in_threads, threads, unthrottled
+    )
+    results[f"RateLimiter.wait ({threads} threads x {tasks_per_thread} tasks)"] = {
+        "count": calls,
+        "ops_per_sec": calls / elapsed,
+        "mean_us": elapsed / calls * 1e6,
+        # every admission must be counted exactly once, however the threads interleave
+        "admitted": limiter.limit - limiter.remaining,
+    }
+
+    # contention: the limiter is the bottleneck, so every thread should get an equal share of it
+    burst, period, duration = 50, 0.05, 1.0
+    limiter = RateLimiter(10**9, windows=[(burst, period)])
+    counts = [0] * threads
+    deadline = time.monotonic() + duration
+
+    async def throttled(index):
+        async def worker():
+            while time.monotonic() < deadline:
+                await limiter.wait()
+                counts[index] += 1
+
+        await asyncio.gather(*[worker() for _ in range(tasks_per_thread)])
+
+    elapsed = await asyncio.get_running_loop().run_in_executor(
+        None, _in_threads, threads, throttled
+    )
+    results[f"RateLimiter contention ({threads} threads)"] = {
+        "admitted": sum(counts),
+        "allowed": int(burst * (elapsed // period + 1)),
+        "per_thread": counts,
+        "fairness": _jain_index(counts),
+    }
+
+    return results
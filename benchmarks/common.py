@@ -0,0 +1,54 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+import asyncio
+import statistics
+import time
+
+
+def percentile(samples, p):
+    """Returns the ``p`` (0-100) percentile of a list of samples using nearest-rank."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, elapsed):
+    """Summarizes per-operation latencies (in seconds) measured over ``elapsed`` seconds of wall time."""
+    return {
+        "count": len(latencies),
+        "ops_per_sec": len(latencies) / elapsed if elapsed else None,
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else None,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else None,
+    }
+
+
+async def measure_async(func, iterations, concurrency=1):
+    """Calls a coroutine function ``iterations`` times from ``concurrency`` workers and summarizes the latencies."""
+    latencies = []
+    remaining = iter(range(iterations))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await func()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def measure(func, iterations):
+    """Calls a function ``iterations`` times and summarizes the latencies."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - t)
+    return summarize(latencies, time.perf_counter() - start)
@@ -0,0 +1,156 @@
+"""
+Synthetic API payloads shaped like real NASA API responses, used to build benchmark cassettes.
+"""
+
+import datetime
+import json
+
+from aionasa.exoplanet.api import BASE_URL as EXOPLANET_URL
+from aionasa.replay import Cassette
+
+START_DATE = datetime.date(2020, 1, 1)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def apod(date):
+    return {
+        "date": date.strftime("%Y-%m-%d"),
+        "title": f"Picture for {date}",
+        "explanation": "An astronomy picture. " * 50,
+        "url": f"https://apod.nasa.gov/apod/image/{date:%y%m}/bench_{date:%d}.jpg",
+        "hdurl": f"https://apod.nasa.gov/apod/image/{date:%y%m}/bench_{date:%d}_hd.jpg",
+        "media_type": "image",
+        "service_version": "v1",
+        "copyright": "aionasa",
+    }
+
+
+def epic_image(date, index):
+    xyz = {"x": 1.0, "y": 2.0, "z": 3.0}
+    return {
+        "identifier": f"{date:%Y%m%d}{index:06d}",
+        "caption": "This image was taken by NASA's EPIC camera onboard the NOAA DSCOVR spacecraft",
+        "image": f"epic_1b_{date:%Y%m%d}{index:06d}",
+        "version": "03",
+        "date": f"{date:%Y-%m-%d} 00:{index % 60:02d}:00",
+        "centroid_coordinates": {"lat": 1.5, "lon": -20.25},
+        "dscovr_j2000_position": xyz,
+        "lunar_j2000_position": xyz,
+        "sun_j2000_position": xyz,
+        "attitude_quaternions": {"q0": 0.1, "q1": 0.2, "q2": 0.3, "q3": 0.4},
+        "coords": {},
+    }
+
+
+def asteroid(index, approaches=20):
+    approach = {
+        "close_approach_date": "2020-01-01",
+        "close_approach_date_full": "2020-Jan-01 12:34",
+        "epoch_date_close_approach": 1577882040000,
+        "epoch_date": 1577882040000,
+        "relative_velocity": {"kilometers_per_second": "10.1"},
+        "miss_distance": {"astronomical": "0.3"},
+        "orbiting_body": "Earth",
+    }
+    return {
+        "id": str(2000000 + index),
+        "neo_reference_id": str(2000000 + index),
+        "designation": f"{index} Bench",
+        "name": f"{index} Bench",
+        "nasa_jpl_url": f"http://ssd.jpl.nasa.gov/sbdb.cgi?sstr={2000000 + index}",
+        "absolute_magnitude_h": 15.5,
+        "is_potentially_hazardous_asteroid": False,
+        "is_sentry_object": False,
+        "estimated_diameter": {
+            unit: {"estimated_diameter_min": 1.0, "estimated_diameter_max": 2.0}
+            for unit in ("kilometers", "meters", "miles", "feet")
+        },
+        "close_approach_data": [approach] * approaches,
+        "orbital_data": {
+            "orbit_id": "659",
+            "orbit_determination_date": "2021-04-15 06:31:46",
+            "first_observation_date": "1893-10-29",
+            "last_observation_date": "2021-04-13",
+            "data_arc_in_days": "46183",
+            "observations_used": "9130",
+            "orbit_uncertainty": "0",
+            "minimum_orbit_intersection": ".148623",
+            "jupiter_tisserand_invariant": "4.582",
+            "epoch_osculation": "2459000.5",
+            "eccentricity": ".2229512647434284",
+            "semi_major_axis": "1.458045729081037",
+            "inclination": "10.83054121829922",
+            "ascending_node_longitude": "304.2993259000444",
+            "orbital_period": "643.0654021020583",
+            "perihelion_distance": "1.132972589728666",
+            "perihelion_argument": "178.8822959227224",
+            "aphelion_distance": "1.783118868433408",
+            "perihelion_time": "2459159.351922368362",
+            "mean_anomaly": "271.0717325705167",
+            "mean_motion": ".5598186418120109",
+            "equinox": "J2000",
+            "orbit_class": {"orbit_class_type": "AMO"},
+        },
+    }
+
+
+def feed(days, per_day):
+    dates = [START_DATE + datetime.timedelta(days=i) for i in range(days)]
+    base = "http://api.nasa.gov/neo/rest/v1/feed"
+    return {
+        "links": {"self": base, "prev": base, "next": base},
+        "element_count": days * per_day,
+        "near_earth_objects": {
+            f"{date:%Y-%m-%d}": [asteroid(i) for i in range(per_day)] for date in dates
+        },
+    }
+
+
+def insight():
+    sol = {"AT": {"av": -62.3, "mn": -96.9, "mx": -15.5}, "Season": "fall"}
+    return {str(sol_key): sol for sol_key in range(675, 682)}
+
+
+def build_cassette(asset_size):
+    """Builds a cassette covering every request made by the client benchmarks."""
+    cassette = Cassette()
+
+    def add(url, body, headers=JSON_HEADERS):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        cassette.record(url, 200, "OK", headers, body)
+
+    day = START_DATE.strftime("%Y-%m-%d")
+    end = (START_DATE + datetime.timedelta(days=29)).strftime("%Y-%m-%d")
+    add(f"https://api.nasa.gov/planetary/apod?date={day}", apod(START_DATE))
+    add(
+        f"https://api.nasa.gov/planetary/apod?start_date={day}&end_date={end}",
+        [apod(START_DATE + datetime.timedelta(days=i)) for i in range(30)],
+    )
+    add(
+        f"https://epic.gsfc.nasa.gov/api/natural/date/{day}",
+        [epic_image(START_DATE, i) for i in range(20)],
+    )
+    add(
+        "https://epic.gsfc.nasa.gov/api/natural/available",
+        [f"{START_DATE + datetime.timedelta(days=i):%Y-%m-%d}" for i in range(2000)],
+    )
+    add(
+        f"https://api.nasa.gov/neo/rest/v1/feed?start_date={day}",
+        feed(days=7, per_day=10),
+    )
+    add("https://api.nasa.gov/neo/rest/v1/neo/2000001", asteroid(1))
+    add(
+        "https://api.nasa.gov/insight_weather/?ver=1.0&feedtype=json",
+        insight(),
+    )
+    add(
+        f"{EXOPLANET_URL}?table=exoplanets&select=pl_hostname,ra,dec&format=json",
+        [{"pl_hostname": f"star {i}", "ra": i, "dec": -i} for i in range(500)],
+    )
+    add(
+        "https://apod.nasa.gov/apod/image/bench.jpg",
+        b"\xff" * asset_size,
+        {"Content-Type": "image/jpeg", "Accept-Ranges": "bytes"},
+    )
+    return cassette
@@ -0,0 +1,111 @@
+"""
+Runs the aionasa benchmark suite and writes the results as JSON.
+
+Usage:
+    python benchmarks/run.py [--output results.json] [--only clients,parsing,assets,rate_limit,import]
+
+Everything runs against a local stub server, so no network access or API quota is needed.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aionasa  # noqa: E402
+import bench_assets  # noqa: E402
+import bench_clients  # noqa: E402
+import bench_import  # noqa: E402
+import bench_parsing  # noqa: E402
+import bench_rate_limit  # noqa: E402
+
+SUITES = ("clients", "parsing", "assets", "rate_limit", "import")
+
+
+parser = argparse.ArgumentParser(description="Run the aionasa benchmark suite.")
+parser.add_argument(
+    "--output", "-o", help="File to write JSON results to. Prints to stdout by default."
+)
+parser.add_argument(
+    "--only",
+    help=f"Comma-separated list of suites to run. Choices: {', '.join(SUITES)}",
+)
+parser.add_argument(
+    "--iterations", type=int, default=200, help="Iterations per benchmark case."
+)
+parser.add_argument(
+    "--concurrency",
+    type=int,
+    default=1,
+    help="Concurrent workers for the client benchmarks.",
+)
+parser.add_argument(
+    "--latency",
+    type=float,
+    default=0.0,
+    help="Latency injected by the stub server, in seconds.",
+)
+parser.add_argument(
+    "--bandwidth",
+    type=int,
+    help="Per-connection bandwidth of the stub server for the asset benchmarks, in bytes per second.",
+)
+parser.add_argument(
+    "--threads",
+    type=int,
+    default=4,
+    help="Threads (each with its own event loop) sharing a limiter in the rate limit benchmarks.",
+)
+parser.add_argument(
+    "--asset-size",
+    type=int,
+    default=8 * 1024 * 1024,
+    help="Size of the asset used for download benchmarks, in bytes.",
+)
+
+
+async def main():
+    args = parser.parse_args()
+    suites = args.only.split(",") if args.only else SUITES
+
+    results = {
+        "aionasa_version": aionasa.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+
+    if "clients" in suites:
+        results["results"]["clients"] = await bench_clients.run(
+            args.iterations, args.concurrency, args.latency
+        )
+    if "parsing" in suites:
+        results["results"]["parsing"] = await bench_parsing.run(args.iterations)
+    if "assets" in suites:
+        results["results"]["assets"] = await bench_assets.run(
+            max(1, args.iterations // 20), args.asset_size, args.bandwidth
+        )
+    if "rate_limit" in suites:
+        results["results"]["rate_limit"] = await bench_rate_limit.run(
+            100, args.iterations, args.threads
+        )
+
+    if "import" in suites:
+        results["results"]["import"] = await bench_import.run(
+            max(3, args.iterations // 20)
+        )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())